@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark the TenX logo renderers: wall time, peak memory and per-stage timings
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+import PIL
+
+import create_logo
+import create_simple_logo
+from instrumentation import StageRecorder
+from logo_export import timed_encode
+from logo_scene import clear_caches
+
+RENDERERS = {
+    "create_logo": create_logo.create_tenx_logo,
+    "create_simple_logo": create_simple_logo.create_tenx_logo,
+}
+
+ICON_SIZES = [1024, 512, 256, 180, 120, 87, 80, 60, 58, 40, 29, 20]
+LARGE_SIZES = [2048, 4096]
+
+def render_once(render, size, profile):
+    """Cold render plus PNG encode of one size, returning (wall seconds, stages)"""
+    clear_caches()
+    with StageRecorder() as recorder:
+        start = time.perf_counter()
+        img = render(size)
+        timed_encode(img, profile)
+        wall = time.perf_counter() - start
+    return wall, recorder.as_dict()
+
+def peak_memory(render, size, profile):
+    """Peak traced allocation in bytes for one cold render plus encode"""
+    clear_caches()
+    tracemalloc.start()
+    try:
+        timed_encode(render(size), profile)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(renderers, sizes, repeat, profile):
+    """Benchmark every renderer x size; timings are the best of repeat runs"""
+    results = []
+    for name in renderers:
+        render = RENDERERS[name]
+        for size in sizes:
+            runs = [render_once(render, size, profile) for _ in range(repeat)]
+            wall, stages = min(runs, key=lambda run: run[0])
+            results.append({
+                "renderer": name,
+                "size": size,
+                "wall_seconds": wall,
+                "peak_bytes": peak_memory(render, size, profile),
+                "stages": stages,
+            })
+            print(f"{name:>20} {size:>5}px  {wall * 1000:8.1f} ms  "
+                  f"{results[-1]['peak_bytes'] / 1e6:8.1f} MB")
+    return results
+
+def compare(results, baseline_path):
+    """Print wall-time ratios against a previous JSON report"""
+    with open(baseline_path) as f:
+        baseline = {
+            (entry["renderer"], entry["size"]): entry
+            for entry in json.load(f)["results"]
+        }
+    print(f"\nCompared with {baseline_path}:")
+    for entry in results:
+        old = baseline.get((entry["renderer"], entry["size"]))
+        if old:
+            ratio = entry["wall_seconds"] / old["wall_seconds"]
+            flag = "  ⚠️ slower" if ratio > 1.1 else ""
+            print(f"{entry['renderer']:>20} {entry['size']:>5}px  x{ratio:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TenX logo generation")
+    parser.add_argument("--renderer", action="append", choices=sorted(RENDERERS),
+                        help="renderer to benchmark (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=ICON_SIZES + LARGE_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profile", default="default", help="PNG export profile")
+    parser.add_argument("--output", default="logo_benchmark.json")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    results = run(args.renderer or sorted(RENDERERS), args.sizes, args.repeat, args.profile)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "profile": args.profile,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Xcode project generator on synthetic source trees
+
+Each tree size gets a fresh temporary tree. A cold run generates the
+project from scratch; a warm run regenerates it over the existing project
+file, reusing its IDs (a file the generator last wrote with stable IDs only
+is not parsed again). Both report the generator phases
+(discover, ids, plan, write) separately, and a traced run records peak
+memory. The written project must parse and serialize back byte for byte.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from generate_xcode import create_project, load_spec, SPEC_PATH
+from instrumentation import StageRecorder
+from pbxproj import parse_file
+
+SIZES = [100, 10_000, 100_000]
+LAYERS = ("Models", "Services", "Views")
+
+def make_tree(root, count, per_dir=25):
+    """Create count empty Swift files under root, nested like a modular app
+
+    Files are spread over Feature<N>/<Layer>/Group<M>/ directories with at
+    most per_dir files each, every fourth group one level deeper, plus a
+    top-level App.swift.
+    """
+    open(os.path.join(root, "App.swift"), "w").close()
+    for index in range(count - 1):
+        directory, slot = divmod(index, per_dir)
+        feature, rest = divmod(directory, 3 * 8)
+        layer, group = divmod(rest, 8)
+        path = os.path.join(root, f"Feature{feature:04d}", LAYERS[layer], f"Group{group}")
+        if group % 4 == 3:
+            path = os.path.join(path, "Detail")
+        if slot == 0:
+            os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, f"F{feature:04d}{LAYERS[layer]}{group}File{slot:02d}.swift"), "w").close()
+
+def generate_once(root, spec, cold):
+    """One generation, returning (wall seconds, stages)"""
+    if cold:
+        shutil.rmtree(os.path.join(root, f"{spec.name}.xcodeproj"), ignore_errors=True)
+    with StageRecorder() as recorder:
+        start = time.perf_counter()
+        create_project(root, quiet=True, spec=spec)
+        wall = time.perf_counter() - start
+    return wall, recorder.as_dict()
+
+def peak_memory(root, spec):
+    """Peak traced allocation in bytes for one cold generation"""
+    shutil.rmtree(os.path.join(root, f"{spec.name}.xcodeproj"), ignore_errors=True)
+    tracemalloc.start()
+    try:
+        create_project(root, quiet=True, spec=spec)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def round_trips(project_file):
+    """(parses and serializes back unchanged, parse seconds)"""
+    start = time.perf_counter()
+    project = parse_file(project_file)
+    elapsed = time.perf_counter() - start
+    with open(project_file, encoding="utf-8") as f:
+        return project.serialize() == f.read(), elapsed
+
+def run(sizes, repeat, spec):
+    """Benchmark every tree size; timings are the best of repeat runs"""
+    results = []
+    for count in sizes:
+        root = tempfile.mkdtemp(prefix=f"tenx-xcode-{count}-")
+        try:
+            make_tree(root, count)
+            entry = {"files": count}
+            for mode in ("cold", "warm"):
+                runs = [generate_once(root, spec, mode == "cold") for _ in range(repeat)]
+                wall, stages = min(runs, key=lambda run: run[0])
+                entry[mode] = {"wall_seconds": wall, "stages": stages}
+            project_file = os.path.join(root, f"{spec.name}.xcodeproj", "project.pbxproj")
+            entry["project_bytes"] = os.path.getsize(project_file)
+            entry["round_trip"], entry["parse_seconds"] = round_trips(project_file)
+            entry["peak_bytes"] = peak_memory(root, spec)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        results.append(entry)
+        for mode in ("cold", "warm"):
+            stages = "  ".join(f"{name} {stage['seconds'] * 1000:.0f}"
+                               for name, stage in entry[mode]["stages"].items())
+            wall = entry[mode]["wall_seconds"]
+            print(f"{count:>8} files {mode}  {wall * 1000:8.1f} ms  {wall / count * 1e6:6.2f} µs/file  "
+                  f"({stages} ms)")
+        flag = "✅" if entry["round_trip"] else "❌"
+        print(f"{'':>14}{flag} round trip, parse {entry['parse_seconds'] * 1000:.0f} ms, "
+              f"peak {entry['peak_bytes'] / 1e6:.1f} MB, {entry['project_bytes'] / 1e6:.1f} MB project")
+    return results
+
+def compare(results, baseline_path):
+    """Print wall-time ratios against a previous JSON report"""
+    with open(baseline_path) as f:
+        baseline = {entry["files"]: entry for entry in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path}:")
+    for entry in results:
+        old = baseline.get(entry["files"])
+        if old:
+            for mode in ("cold", "warm"):
+                ratio = entry[mode]["wall_seconds"] / old[mode]["wall_seconds"]
+                flag = "  ⚠️ slower" if ratio > 1.1 else ""
+                print(f"{entry['files']:>8} files {mode}  x{ratio:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Xcode project generation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--spec", default=SPEC_PATH, help="project spec to generate")
+    parser.add_argument("--output", default="xcode_benchmark.json")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, load_spec(args.spec))
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Wrote {len(results)} results to {args.output}")
+
+    per_file = [entry["cold"]["wall_seconds"] / entry["files"] for entry in results if entry["files"] >= 1000]
+    if len(per_file) > 1 and max(per_file) > 2 * min(per_file):
+        print("⚠️  Cost per file grows with tree size: generation is not linear")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0 if all(entry["round_trip"] for entry in results) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
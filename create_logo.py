@@ -3,118 +3,174 @@
 Generate TenX app logo
 """
 
-from PIL import Image, ImageDraw, ImageFont
-import os
+import argparse
 
-def create_tenx_logo(size):
-    """Create a modern TenX logo"""
-    # Create image with gradient background
-    img = Image.new('RGB', (size, size), color='#000000')
-    draw = ImageDraw.Draw(img)
-    
-    # Create gradient background (dark blue to purple)
-    for y in range(size):
-        # Gradient from dark blue (#0A1929) to purple (#1A0A29)
-        r = int(10 + (26 - 10) * (y / size))
-        g = int(25 - 15 * (y / size))
-        b = int(41)
-        draw.rectangle([(0, y), (size, y+1)], fill=(r, g, b))
-    
-    # Add subtle grid pattern
-    grid_color = (255, 255, 255, 20)
-    grid_spacing = size // 10
-    for i in range(0, size, grid_spacing):
-        draw.line([(i, 0), (i, size)], fill=grid_color, width=1)
-        draw.line([(0, i), (size, i)], fill=grid_color, width=1)
-    
-    # Draw "10X" text
-    font_size = int(size * 0.35)
-    try:
-        # Try to use a bold system font
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-    except:
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/SFNSDisplay.ttf", font_size)
-        except:
-            # Fallback to default with size
-            font = ImageFont.load_default()
-            font_size = int(size * 0.2)  # Adjust for default font
-    
-    # Draw text with glow effect
-    text = "10X"
-    
-    # Get text bounding box
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    # Center position
-    x = (size - text_width) // 2
-    y = (size - text_height) // 2 - int(size * 0.05)
-    
-    # Draw glow effect (multiple layers)
-    glow_colors = [
-        (0, 255, 255, 30),   # Cyan glow
-        (0, 200, 255, 50),
-        (0, 150, 255, 70),
-    ]
-    
-    for i, glow_color in enumerate(glow_colors):
-        offset = (len(glow_colors) - i) * 3
-        for dx in range(-offset, offset+1):
-            for dy in range(-offset, offset+1):
-                if dx*dx + dy*dy <= offset*offset:
-                    draw.text((x + dx, y + dy), text, font=font, fill=glow_color)
-    
-    # Draw main text (white with slight blue tint)
-    draw.text((x, y), text, font=font, fill=(255, 255, 255))
-    
-    # Add accent line below text
-    line_y = y + text_height + int(size * 0.05)
-    line_width = int(text_width * 0.8)
-    line_x = x + (text_width - line_width) // 2
-    
-    # Gradient line (cyan to blue)
-    for i in range(line_width):
-        progress = i / line_width
-        r = int(0 + (100 - 0) * progress)
-        g = int(255 - 100 * progress)
-        b = 255
-        draw.rectangle(
-            [(line_x + i, line_y), (line_x + i + 1, line_y + int(size * 0.015))],
-            fill=(r, g, b)
-        )
-    
-    return img
+from instrumentation import TRACE_ENV, stage, traced
+from logo_assets import (APPEARANCES, DEFAULT_APPICONSET, alternate_appiconset, icon_filename,
+                         slot_pixel_sizes, sync_appiconset)
+from logo_cache import DEFAULT_CACHE_DIR, RenderCache
+from logo_export import PROFILES, ExportResult, format_result, timed_encode
+from logo_fonts import find_font
+from logo_gradient import BACKGROUND_BOTTOM, BACKGROUND_TOP
+from logo_pyramid import pyramid
+from logo_scene import GlowLayer, GradientLayer, GridLayer, TextLayer, UnderlineLayer, render_scene
+from logo_variants import grayscale, render_variants
+
+# Layers of the logo, bottom first (see logo_scene for the layer types)
+TEXT = TextLayer("10X", (255, 255, 255), scale=0.35, fallback_scale=0.2, y_shift=-0.05)
+SCENE = (
+    # Gradient background (dark blue #0A1929 to purple #1A0A29)
+    GradientLayer(BACKGROUND_TOP, BACKGROUND_BOTTOM),
+    # Subtle grid pattern
+    GridLayer((255, 255, 255, 20), divisions=10),
+    # Cyan glow around the text, outermost ring first
+    GlowLayer(TEXT, rings=(
+        ((0, 255, 255, 30), 9),
+        ((0, 200, 255, 50), 6),
+        ((0, 150, 255, 70), 3),
+    )),
+    # Main "10X" text
+    TEXT,
+    # Accent line below the text (cyan to blue)
+    UnderlineLayer(TEXT, (0, 255, 255), (100, 155, 255), width=0.8, gap=0.05, thickness=0.015),
+)
+
+# Variant palettes: color role -> replacement color (roles are named in
+# logo_scene's Bases, "glow.0" being the outermost ring; see logo_variants).
+# "dark" and "tinted" are iOS icon appearances; the others are alternate icons.
+PALETTES = {
+    "dark": {"gradient.start": (0, 0, 0), "gradient.end": (14, 6, 22)},
+    "tinted": grayscale,
+    "light": {
+        "gradient.start": (240, 246, 252), "gradient.end": (234, 228, 248),
+        "grid": (16, 28, 56), "text": (16, 28, 56),
+        "glow.0": (0, 170, 220), "underline.start": (0, 170, 220),
+    },
+    "halloween": {
+        "gradient.start": (22, 10, 2), "gradient.end": (36, 8, 36),
+        "glow.0": (255, 150, 0), "glow.1": (255, 110, 0), "glow.2": (255, 70, 0),
+        "underline.start": (255, 150, 0), "underline.end": (170, 70, 255),
+    },
+    "winter": {
+        "gradient.start": (8, 32, 52), "gradient.end": (24, 44, 80),
+        "glow.0": (200, 245, 255), "glow.1": (150, 220, 255), "glow.2": (110, 190, 255),
+        "underline.start": (200, 245, 255), "underline.end": (230, 240, 255),
+    },
+}
+
+def create_tenx_logo(size, variant=None):
+    """Create a modern TenX logo (optionally in one of the PALETTES variants)"""
+    if variant:
+        return render_variants(SCENE, size, {variant: PALETTES[variant]})[variant]
+    return render_scene(SCENE, size)
+
+def create_tenx_variants(size, variants):
+    """Render several variants at once, sharing the scene geometry: {variant: Image}"""
+    return render_variants(SCENE, size, {variant: PALETTES[variant] for variant in variants})
+
+def _report(appiconset, report):
+    for name in report.written:
+        print(f"  updated {name}")
+    for name in report.removed:
+        print(f"  removed {name}")
+    print(f"✅ Synced TenX logos into: {appiconset} "
+          f"({len(report.written)} written, {len(report.unchanged)} unchanged)")
 
 def main():
-    # Create logo in multiple sizes for iOS
-    sizes = [1024, 512, 256, 180, 120, 87, 80, 60, 58, 40, 29, 20]
-    
-    output_dir = "/Volumes/pookiepants/POOKIEPANTS/AI Code/CascadeProjects/windsurf-project/personal-journal/TenX/AppIcon"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    for size in sizes:
-        print(f"Creating {size}x{size} logo...")
-        img = create_tenx_logo(size)
-        
-        # Save with appropriate naming
-        if size == 1024:
-            filename = f"AppIcon-{size}.png"
-        else:
-            filename = f"AppIcon-{size}x{size}.png"
-        
-        img.save(os.path.join(output_dir, filename), 'PNG')
-    
-    # Create the main 1024x1024 for the asset catalog
-    main_logo = create_tenx_logo(1024)
-    main_logo.save(os.path.join(output_dir, "AppIcon-1024x1024.png"), 'PNG')
-    
-    print(f"✅ Created TenX logos in: {output_dir}")
-    print("\nTo use in Xcode:")
-    print("1. Open Assets.xcassets")
-    print("2. Click on AppIcon")
-    print("3. Drag AppIcon-1024x1024.png to the 1024x1024 slot")
+    parser = argparse.ArgumentParser(description="Generate TenX app logos")
+    parser.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                        help="asset catalog icon set to sync into (default: Assets.xcassets/AppIcon.appiconset)")
+    parser.add_argument("--direct", action="store_true",
+                        help="render every size from scratch instead of downscaling one master")
+    parser.add_argument("--supersample", type=int, default=1,
+                        help="master render scale factor in pyramid mode (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-render every size")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default",
+                        help="PNG export profile: fast (dev), default, small (release)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="palette-quantize small sizes in profiles that allow it")
+    parser.add_argument("--variant", action="append", choices=sorted(PALETTES),
+                        help="also render a palette variant (repeatable)")
+    parser.add_argument("--all-variants", action="store_true",
+                        help="render every palette variant")
+    parser.add_argument("--trace", default=None,
+                        help=f"write a Chrome trace of the run to this file (or set ${TRACE_ENV})")
+    args = parser.parse_args()
+    with traced(args.trace):
+        generate(args)
+
+def generate(args):
+    """Render, encode and sync every icon the parsed command line asks for"""
+    # Every pixel size the iPhone and iPad icon slots need
+    sizes = slot_pixel_sizes()
+    variants = sorted(PALETTES) if args.all_variants else sorted(set(args.variant or ()))
+    # None is the default icon; it is rendered from the layer rasters directly
+    targets = [(variant, size) for variant in [None] + variants for size in sizes]
+    
+    cache = None if args.no_cache else RenderCache(args.cache_dir)
+    font_path = find_font() or "default"
+    mode = "direct" if args.direct else f"pyramid-{max(sizes) * args.supersample}"
+    
+    keys = {}
+    pngs = {}
+    if cache:
+        with stage("cache"):
+            keys = {
+                target: cache.key(create_tenx_logo, target[1], target[0], mode=mode, font=font_path,
+                                  profile=args.profile, quantize=args.quantize)
+                for target in targets
+            }
+            pngs = {target: cache.get(keys[target]) for target in targets}
+    missing = [target for target in targets if pngs.get(target) is None]
+    missing_variants = sorted({variant for variant, _ in missing if variant})
+    
+    images = {}
+    if not missing:
+        print("Logos are up to date (render cache hit)")
+    elif args.direct:
+        for size in sorted({size for _, size in missing}, reverse=True):
+            print(f"Creating {size}x{size} logo...")
+            if (None, size) in missing:
+                images[None, size] = create_tenx_logo(size)
+            # All variants of a size come out of one color-mapping pass
+            wanted = [variant for variant in missing_variants if (variant, size) in missing]
+            if wanted:
+                for variant, img in create_tenx_variants(size, wanted).items():
+                    images[variant, size] = img
+    else:
+        master_size = max(sizes) * args.supersample
+        print(f"Creating {master_size}px master logo...")
+        masters = create_tenx_variants(master_size, missing_variants) if missing_variants else {}
+        if any(variant is None for variant, _ in missing):
+            masters[None] = create_tenx_logo(master_size)
+        for variant, master in masters.items():
+            images.update({(variant, size): img for size, img in pyramid(master, sizes).items()})
+    
+    for target in missing:
+        variant, size = target
+        data, seconds = timed_encode(images[target], args.profile, args.quantize)
+        pngs[target] = data
+        if cache:
+            cache.put(keys[target], data)
+        print(format_result(ExportResult(icon_filename(size, variant), len(data), seconds)))
+    
+    by_variant = {variant: {size: pngs[variant, size] for size in sizes} for variant in [None] + variants}
+    
+    # Write Contents.json and only the PNGs whose bytes changed. Dark and
+    # tinted go into the main icon set as appearances, every other variant
+    # into its own alternate icon set.
+    appearances = {variant: by_variant[variant] for variant in variants if variant in APPEARANCES}
+    with stage("sync"):
+        report = sync_appiconset(args.appiconset, by_variant[None], appearances=appearances)
+    _report(args.appiconset, report)
+    for variant in variants:
+        if variant not in APPEARANCES:
+            appiconset = alternate_appiconset(variant, args.appiconset)
+            with stage("sync"):
+                report = sync_appiconset(appiconset, by_variant[variant])
+            _report(appiconset, report)
 
 if __name__ == "__main__":
     main()
@@ -2,166 +2,360 @@
 """
 Generate a valid Xcode project file for TenX
 Compatible with Xcode 15.4
+
+Targets, configurations and build settings come from a project spec
+(project_spec.json by default, see xcode_spec.py); the sources of every
+target are found in one pass over the tree.
 """
 
+import argparse
+import filecmp
+import hashlib
+import json
 import os
-import uuid
 import glob
+import time
+from collections import namedtuple
 
-def generate_uuid():
-    """Generate a 24-character hex string like Xcode uses"""
-    return uuid.uuid4().hex[:24].upper()
-
-def find_swift_files(base_path):
-    """Find all Swift files in the project"""
-    swift_files = []
-    for root, dirs, files in os.walk(base_path):
-        # Skip hidden directories and build directories
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['build', 'DerivedData']]
-        for file in files:
-            if file.endswith('.swift'):
-                rel_path = os.path.relpath(os.path.join(root, file), base_path)
-                swift_files.append(rel_path)
-    return sorted(swift_files)
-
-def create_project():
-    base_path = "/Volumes/pookiepants/POOKIEPANTS/AI Code/CascadeProjects/windsurf-project/personal-journal/TenX"
-    
-    # Find all Swift files
-    swift_files = find_swift_files(base_path)
-    
-    # Generate UUIDs for all files and references
-    file_refs = {f: generate_uuid() for f in swift_files}
-    build_files = {f: generate_uuid() for f in swift_files}
-    
-    # Additional UUIDs
-    main_group_id = generate_uuid()
-    products_group_id = generate_uuid()
-    frameworks_group_id = generate_uuid()
-    target_id = generate_uuid()
-    native_target_id = generate_uuid()
-    config_list_project_id = generate_uuid()
-    config_list_target_id = generate_uuid()
-    debug_config_id = generate_uuid()
-    release_config_id = generate_uuid()
-    debug_config_target_id = generate_uuid()
-    release_config_target_id = generate_uuid()
-    sources_build_phase_id = generate_uuid()
-    frameworks_build_phase_id = generate_uuid()
-    resources_build_phase_id = generate_uuid()
-    product_ref_id = generate_uuid()
-    assets_ref_id = generate_uuid()
-    assets_build_id = generate_uuid()
-    info_plist_ref_id = generate_uuid()
-    
-    # Build the PBXBuildFile section
-    build_file_section = ""
-    for file_path, build_id in build_files.items():
-        build_file_section += f"\t\t{build_id} /* {os.path.basename(file_path)} in Sources */ = {{isa = PBXBuildFile; fileRef = {file_refs[file_path]} /* {os.path.basename(file_path)} */; }};\n"
-    
-    # Add Assets build file
-    build_file_section += f"\t\t{assets_build_id} /* Assets.xcassets in Resources */ = {{isa = PBXBuildFile; fileRef = {assets_ref_id} /* Assets.xcassets */; }};\n"
-    
-    # Build the PBXFileReference section
-    file_ref_section = ""
-    for file_path, ref_id in file_refs.items():
-        file_ref_section += f"\t\t{ref_id} /* {os.path.basename(file_path)} */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = \"{file_path}\"; sourceTree = \"<group>\"; }};\n"
-    
-    # Add other file references
-    file_ref_section += f"\t\t{product_ref_id} /* TenX.app */ = {{isa = PBXFileReference; explicitFileType = wrapper.application; includeInIndex = 0; path = TenX.app; sourceTree = BUILT_PRODUCTS_DIR; }};\n"
-    file_ref_section += f"\t\t{assets_ref_id} /* Assets.xcassets */ = {{isa = PBXFileReference; lastKnownFileType = folder.assetcatalog; path = Assets.xcassets; sourceTree = \"<group>\"; }};\n"
-    file_ref_section += f"\t\t{info_plist_ref_id} /* Info.plist */ = {{isa = PBXFileReference; lastKnownFileType = text.plist.xml; path = Info.plist; sourceTree = \"<group>\"; }};\n"
-    
-    # Build sources phase
-    sources_phase = ""
-    for file_path, build_id in build_files.items():
-        sources_phase += f"\t\t\t\t{build_id} /* {os.path.basename(file_path)} in Sources */,\n"
-    
-    # Create the project file content
-    project_content = f"""// !$*UTF8*$!
-{{
-\tarchiveVersion = 1;
-\tclasses = {{
-\t}};
-\tobjectVersion = 56;
-\tobjects = {{
+from instrumentation import stage, traced
+from pbxproj import PBXParseError, parse_file, quote
+from swift_sources import SourceIndex
+from xcode_spec import TARGET_TYPES, build_spec, load_spec, target_sources
+from xcode_validate import validate_file
+
+BASE_PATH = "/Volumes/pookiepants/POOKIEPANTS/AI Code/CascadeProjects/windsurf-project/personal-journal/TenX"
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "project_spec.json")
+# Next to project.pbxproj: its size and mtime when last written with stable IDs only
+STABLE_MARKER = ".stable_ids"
+
+# lastKnownFileType of resource references, by extension
+RESOURCE_TYPES = {
+    ".xcassets": "folder.assetcatalog",
+    ".plist": "text.plist.xml",
+    ".entitlements": "text.plist.entitlements",
+    ".storyboard": "file.storyboard",
+    ".xib": "file.xib",
+    ".strings": "text.plist.strings",
+    ".json": "text.json",
+}
+
+# Build phase isa -> ObjectIds role
+PHASE_ROLES = {
+    "PBXSourcesBuildPhase": "sources_build_phase",
+    "PBXFrameworksBuildPhase": "frameworks_build_phase",
+    "PBXResourcesBuildPhase": "resources_build_phase",
+}
+
+def stable_id(role, key=""):
+    """24-character hex ID like Xcode uses, derived from an object's role and key
+
+    The same (role, key) always gives the same ID, so regenerating the
+    project only changes the entries of files that were added or removed.
+    """
+    return hashlib.sha1(f"{role}\0{key}".encode()).hexdigest()[:24].upper()
+
+def existing_ids(project_file):
+    """{(role, key): ID} for the objects of an existing project file
+
+    Groups and files are matched by path ("group" and "file" roles); the
+    project, its targets and their phases, build files, dependencies and
+    configurations are found by walking from the root object and keyed by
+    target and configuration name. IDs that equal their stable_id() are
+    left out, since ObjectIds() gives those anyway. Returns {} when there is
+    no readable project file, and without parsing it when the file is
+    unchanged since the generator last wrote it with stable IDs only.
+    """
+    if _stamp(project_file) == _read_marker(project_file):
+        return {}
+    try:
+        project = parse_file(project_file)
+    except (FileNotFoundError, PBXParseError):
+        return {}
+    objects = project.objects
+
+    def known(role, key, object_id):
+        if role and isinstance(object_id, str) and object_id in objects:
+            ids[role, key] = object_id
+            return objects[object_id]
+        return {}
+
+    def configurations(list_role, config_role, name, list_id):
+        for config_id in known(list_role, name, list_id).get("buildConfigurations", ()):
+            config_name = objects.get(config_id, {}).get("name")
+            known(config_role, f"{name}/{config_name}" if name else config_name, config_id)
+
+    # Nested groups hold paths relative to their parent, so files are keyed
+    # by the full path through the group tree; references outside it by path
+    root = objects.get(project.root.get("rootObject"), {})
+    ids = _group_paths(project, root.get("mainGroup"))
+    in_groups = set(ids.values())
+    for ref_id, ref in project.isa("PBXFileReference"):
+        if ref_id not in in_groups:
+            ids.setdefault(("file", ref.get("path")), ref_id)
+    paths = {ref_id: path for (role, path), ref_id in ids.items() if role == "file"}
+
+    known("project", "", project.root.get("rootObject"))
+    known("main_group", "", root.get("mainGroup"))
+    known("products_group", "", root.get("productRefGroup"))
+    configurations("config_list_project", "project_config", "", root.get("buildConfigurationList"))
+    for target_id in root.get("targets", ()):
+        name = objects.get(target_id, {}).get("name")
+        target = known("native_target", name, target_id)
+        configurations("config_list_target", "target_config", name, target.get("buildConfigurationList"))
+        for phase_id in target.get("buildPhases", ()):
+            phase = known(PHASE_ROLES.get(objects.get(phase_id, {}).get("isa")), name, phase_id)
+            for build_id in phase.get("files", ()):
+                path = paths.get(objects.get(build_id, {}).get("fileRef"))
+                if path:
+                    known("build", f"{name}/{path}", build_id)
+        for dependency_id in target.get("dependencies", ()):
+            dependency = objects.get(dependency_id, {})
+            other = objects.get(dependency.get("target"), {}).get("name")
+            known("dependency", f"{name}/{other}", dependency_id)
+            known("proxy", f"{name}/{other}", dependency.get("targetProxy"))
+    return {(role, key): object_id for (role, key), object_id in ids.items()
+            if object_id != stable_id(role, key)}
+
+def _stamp(project_file):
+    """Size and mtime of project_file, None when it does not exist"""
+    try:
+        stat = os.stat(project_file)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size} {stat.st_mtime_ns}"
+
+def _read_marker(project_file):
+    try:
+        with open(os.path.join(os.path.dirname(project_file), STABLE_MARKER)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def mark_stable_ids(project_file, stable):
+    """Record whether project_file, as it is now, holds stable IDs only
+
+    existing_ids() skips parsing a marked file until anything, Xcode
+    included, rewrites it.
+    """
+    marker = os.path.join(os.path.dirname(project_file), STABLE_MARKER)
+    stamp = _stamp(project_file) if stable else None
+    if stamp is None:
+        if os.path.exists(marker):
+            os.remove(marker)
+    elif stamp != _read_marker(project_file):
+        with open(marker, "w") as f:
+            f.write(stamp)
+
+def _group_paths(project, main_group):
+    """{("group" or "file", full path): ID} for everything under main_group"""
+    ids = {}
+    stack = [(main_group, "")] if main_group in project else []
+    while stack:
+        group_id, prefix = stack.pop()
+        for child_id in project[group_id].get("children", ()):
+            child = project.objects.get(child_id)
+            if child is None:
+                continue
+            path = child.get("path")
+            full_path = f"{prefix}/{path}" if prefix and path else path or prefix
+            if child.get("isa") == "PBXGroup":
+                if path:
+                    ids["group", full_path] = child_id
+                stack.append((child_id, full_path))
+            elif child.get("isa") == "PBXFileReference" and path:
+                ids["file", full_path] = child_id
+    return ids
+
+class ObjectIds:
+    """Object IDs for a generated project
+
+    IDs found in the existing project file are reused; new objects get a
+    stable_id(), so regenerating never renumbers objects that already exist.
+    """
+
+    def __init__(self, existing=None):
+        self.existing = existing or {}
+
+    def __call__(self, role, key=""):
+        return self.existing.get((role, key)) or stable_id(role, key)
+
+def _write_if_changed(path, chunks):
+    """Stream chunks of text into path through a buffered temporary file
+
+    The temporary file replaces path only when its content differs, so an
+    unchanged project keeps its modification time. Returns True if written.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="", buffering=1 << 16) as f:
+        f.writelines(chunks)
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+def find_swift_files(base_path, index_path=None):
+    """Find all Swift files in the project
+
+    With index_path the directory index is kept there between runs, so only
+    directories that changed since the last run are listed again.
+    """
+    index = SourceIndex(base_path, index_path)
+    swift_files = index.scan()
+    index.save()
+    return swift_files
 
-/* Begin PBXBuildFile section */
-{build_file_section}/* End PBXBuildFile section */
+# A Swift source with the strings every section needs, computed once
+SourceFile = namedtuple("SourceFile", "path name ref_id")
 
-/* Begin PBXFileReference section */
-{file_ref_section}/* End PBXFileReference section */
+def source_files(swift_files, ids):
+    """SourceFile for every relative path"""
+    return [SourceFile(path, os.path.basename(path), ids("file", path)) for path in swift_files]
 
-/* Begin PBXFrameworksBuildPhase section */
-\t\t{frameworks_build_phase_id} /* Frameworks */ = {{
-\t\t\tisa = PBXFrameworksBuildPhase;
+# One directory of the source tree: its groups and files, each sorted by name
+Group = namedtuple("Group", "path name id groups files")
+
+def group_tree(files, ids):
+    """Fold sources into a directory trie of Groups, in one pass over the paths
+
+    Returns the root Group (the project directory itself, with no ID).
+    Children are sorted once per node, so the whole build is O(n) apart
+    from those per-directory sorts.
+    """
+    root = ({}, [])
+    for f in files:
+        node = root
+        for part in f.path.split("/")[:-1]:
+            node = node[0].setdefault(part, ({}, []))
+        node[1].append(f)
+
+    def build(node, path, name):
+        subdirs, members = node
+        groups = [build(subdirs[child], f"{path}/{child}" if path else child, child)
+                  for child in sorted(subdirs)]
+        return Group(path, name, ids("group", path) if path else None, groups,
+                     sorted(members, key=lambda f: f.name))
+
+    return build(root, "", "")
+
+# A file outside the source tree (resource or Info.plist) with its ID
+ExtraFile = namedtuple("ExtraFile", "path name ref_id type")
+
+# A spec target with the IDs and members its sections need. sources,
+# resources and frameworks are (build ID, file) pairs; dependencies are
+# (dependency ID, proxy ID, TargetPlan) triples.
+TargetPlan = namedtuple(
+    "TargetPlan",
+    "target id product_id config_list_id config_ids phase_ids sources resources frameworks dependencies",
+)
+
+# The whole project: everything the section emitters render
+ProjectPlan = namedtuple(
+    "ProjectPlan",
+    "spec ids project_id config_list_id config_ids files tree extra_files targets",
+)
+
+def plan_project(spec, swift_files, ids):
+    """ProjectPlan for the spec, given every discovered Swift file"""
+    members = target_sources(spec, swift_files)
+    in_targets = set()
+    for paths in members.values():
+        in_targets.update(paths)
+    files = source_files([path for path in swift_files if path in in_targets], ids)
+    by_path = {f.path: f for f in files}
+
+    # Info.plists first, then resources, each listed once
+    extra_files = {}
+    for target in spec.targets:
+        for path in ([target.info_plist] if target.info_plist else []) + target.resources:
+            if path not in extra_files:
+                extension = os.path.splitext(path)[1]
+                extra_files[path] = ExtraFile(path, os.path.basename(path), ids("file", path),
+                                              RESOURCE_TYPES.get(extension, "file"))
+
+    plans = {}
+    for target in spec.targets:
+        name = target.name
+        plans[name] = TargetPlan(
+            target=target,
+            id=ids("native_target", name),
+            product_id=ids("file", target.product),
+            config_list_id=ids("config_list_target", name),
+            config_ids={config: ids("target_config", f"{name}/{config}") for config in spec.configurations},
+            phase_ids={role: ids(role, name) for role in PHASE_ROLES.values()},
+            sources=[(ids("build", f"{name}/{path}"), by_path[path]) for path in members[name]],
+            resources=[(ids("build", f"{name}/{path}"), extra_files[path]) for path in target.resources],
+            frameworks=[],
+            dependencies=[],
+        )
+    for plan in plans.values():
+        name = plan.target.name
+        for other in plan.target.dependencies:
+            dependency = plans[other]
+            plan.dependencies.append((ids("dependency", f"{name}/{other}"), ids("proxy", f"{name}/{other}"),
+                                      dependency))
+            if dependency.target.type == "framework":
+                plan.frameworks.append((ids("build", f"{name}/{dependency.target.product}"), dependency))
+
+    return ProjectPlan(
+        spec=spec,
+        ids=ids,
+        project_id=ids("project"),
+        config_list_id=ids("config_list_project"),
+        config_ids={config: ids("project_config", config) for config in spec.configurations},
+        files=files,
+        tree=group_tree(files, ids),
+        extra_files=list(extra_files.values()),
+        targets=list(plans.values()),
+    )
+
+# Templates for the objects written once per target or configuration,
+# filled in with str.format
+
+_PHASE_HEAD = """\t\t{id} /* {name} */ = {{
+\t\t\tisa = {isa};
 \t\t\tbuildActionMask = 2147483647;
 \t\t\tfiles = (
-\t\t\t);
+"""
+_PHASE_TAIL = """\t\t\t);
 \t\t\trunOnlyForDeploymentPostprocessing = 0;
-\t\t}};
-/* End PBXFrameworksBuildPhase section */
-
-/* Begin PBXGroup section */
-\t\t{main_group_id} = {{
-\t\t\tisa = PBXGroup;
-\t\t\tchildren = (
-\t\t\t\t{info_plist_ref_id} /* Info.plist */,
-\t\t\t\t{assets_ref_id} /* Assets.xcassets */,
+\t\t};
 """
-    
-    # Add all Swift files to main group
-    for file_path, ref_id in file_refs.items():
-        project_content += f"\t\t\t\t{ref_id} /* {os.path.basename(file_path)} */,\n"
-    
-    project_content += f"""\t\t\t\t{products_group_id} /* Products */,
-\t\t\t);
-\t\t\tsourceTree = "<group>";
-\t\t}};
-\t\t{products_group_id} /* Products */ = {{
-\t\t\tisa = PBXGroup;
-\t\t\tchildren = (
-\t\t\t\t{product_ref_id} /* TenX.app */,
-\t\t\t);
-\t\t\tname = Products;
-\t\t\tsourceTree = "<group>";
-\t\t}};
-/* End PBXGroup section */
 
-/* Begin PBXNativeTarget section */
-\t\t{native_target_id} /* TenX */ = {{
+_NATIVE_TARGET = """\t\t{id} /* {name} */ = {{
 \t\t\tisa = PBXNativeTarget;
-\t\t\tbuildConfigurationList = {config_list_target_id} /* Build configuration list for PBXNativeTarget "TenX" */;
+\t\t\tbuildConfigurationList = {config_list} /* Build configuration list for PBXNativeTarget "{name}" */;
 \t\t\tbuildPhases = (
-\t\t\t\t{sources_build_phase_id} /* Sources */,
-\t\t\t\t{frameworks_build_phase_id} /* Frameworks */,
-\t\t\t\t{resources_build_phase_id} /* Resources */,
+\t\t\t\t{sources} /* Sources */,
+\t\t\t\t{frameworks} /* Frameworks */,
+\t\t\t\t{resources} /* Resources */,
 \t\t\t);
 \t\t\tbuildRules = (
 \t\t\t);
 \t\t\tdependencies = (
-\t\t\t);
-\t\t\tname = TenX;
-\t\t\tproductName = TenX;
-\t\t\tproductReference = {product_ref_id} /* TenX.app */;
-\t\t\tproductType = "com.apple.product-type.application";
+{dependencies}\t\t\t);
+\t\t\tname = {quoted_name};
+\t\t\tproductName = {quoted_name};
+\t\t\tproductReference = {product_id} /* {product} */;
+\t\t\tproductType = "{product_type}";
 \t\t}};
-/* End PBXNativeTarget section */
+"""
+
+_TARGET_ATTRIBUTES = """\t\t\t\t\t{id} = {{
+\t\t\t\t\t\tCreatedOnToolsVersion = 15.4;
+\t\t\t\t\t}};
+"""
 
-/* Begin PBXProject section */
-\t\t{target_id} /* Project object */ = {{
+_PROJECT = """\t\t{id} /* Project object */ = {{
 \t\t\tisa = PBXProject;
 \t\t\tattributes = {{
 \t\t\t\tBuildIndependentTargetsInParallel = 1;
 \t\t\t\tLastSwiftUpdateCheck = 1540;
 \t\t\t\tLastUpgradeCheck = 1540;
 \t\t\t\tTargetAttributes = {{
-\t\t\t\t\t{native_target_id} = {{
-\t\t\t\t\t\tCreatedOnToolsVersion = 15.4;
-\t\t\t\t\t}};
-\t\t\t\t}};
+{target_attributes}\t\t\t\t}};
 \t\t\t}};
-\t\t\tbuildConfigurationList = {config_list_project_id} /* Build configuration list for PBXProject "TenX" */;
+\t\t\tbuildConfigurationList = {config_list} /* Build configuration list for PBXProject "{name}" */;
 \t\t\tcompatibilityVersion = "Xcode 14.0";
 \t\t\tdevelopmentRegion = en;
 \t\t\thasScannedForEncodings = 0;
@@ -169,256 +363,340 @@ def create_project():
 \t\t\t\ten,
 \t\t\t\tBase,
 \t\t\t);
-\t\t\tmainGroup = {main_group_id};
-\t\t\tproductRefGroup = {products_group_id} /* Products */;
+\t\t\tmainGroup = {main_group};
+\t\t\tproductRefGroup = {products_group} /* Products */;
 \t\t\tprojectDirPath = "";
 \t\t\tprojectRoot = "";
 \t\t\ttargets = (
-\t\t\t\t{native_target_id} /* TenX */,
-\t\t\t);
+{targets}\t\t\t);
 \t\t}};
-/* End PBXProject section */
+"""
 
-/* Begin PBXResourcesBuildPhase section */
-\t\t{resources_build_phase_id} /* Resources */ = {{
-\t\t\tisa = PBXResourcesBuildPhase;
-\t\t\tbuildActionMask = 2147483647;
-\t\t\tfiles = (
-\t\t\t\t{assets_build_id} /* Assets.xcassets in Resources */,
-\t\t\t);
-\t\t\trunOnlyForDeploymentPostprocessing = 0;
+_CONTAINER_PROXY = """\t\t{id} /* PBXContainerItemProxy */ = {{
+\t\t\tisa = PBXContainerItemProxy;
+\t\t\tcontainerPortal = {project} /* Project object */;
+\t\t\tproxyType = 1;
+\t\t\tremoteGlobalIDString = {target};
+\t\t\tremoteInfo = {quoted_name};
 \t\t}};
-/* End PBXResourcesBuildPhase section */
+"""
 
-/* Begin PBXSourcesBuildPhase section */
-\t\t{sources_build_phase_id} /* Sources */ = {{
-\t\t\tisa = PBXSourcesBuildPhase;
-\t\t\tbuildActionMask = 2147483647;
-\t\t\tfiles = (
-{sources_phase}\t\t\t);
-\t\t\trunOnlyForDeploymentPostprocessing = 0;
+_TARGET_DEPENDENCY = """\t\t{id} /* PBXTargetDependency */ = {{
+\t\t\tisa = PBXTargetDependency;
+\t\t\ttarget = {target} /* {name} */;
+\t\t\ttargetProxy = {proxy} /* PBXContainerItemProxy */;
 \t\t}};
-/* End PBXSourcesBuildPhase section */
+"""
 
-/* Begin XCBuildConfiguration section */
-\t\t{debug_config_id} /* Debug */ = {{
+_CONFIGURATION = """\t\t{id} /* {name} */ = {{
 \t\t\tisa = XCBuildConfiguration;
 \t\t\tbuildSettings = {{
-\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;
-\t\t\t\tASYNC_AWAIT_CHECKING = YES;
-\t\t\t\tCLANG_ANALYZER_NONNULL = YES;
-\t\t\t\tCLANG_ANALYZER_NUMBER_OBJECT_CONVERSION = YES_AGGRESSIVE;
-\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = "gnu++20";
-\t\t\t\tCLANG_ENABLE_MODULES = YES;
-\t\t\t\tCLANG_ENABLE_OBJC_ARC = YES;
-\t\t\t\tCLANG_ENABLE_OBJC_WEAK = YES;
-\t\t\t\tCLANG_WARN_BLOCK_CAPTURE_AUTORELEASING = YES;
-\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_COMMA = YES;
-\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_DEPRECATED_OBJC_IMPLEMENTATIONS = YES;
-\t\t\t\tCLANG_WARN_DIRECT_OBJC_ISA_USAGE = YES_ERROR;
-\t\t\t\tCLANG_WARN_DOCUMENTATION_COMMENTS = YES;
-\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;
-\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_INFINITE_RECURSION = YES;
-\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_NON_LITERAL_NULL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_OBJC_IMPLICIT_RETAIN_SELF = YES;
-\t\t\t\tCLANG_WARN_OBJC_LITERAL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_OBJC_ROOT_CLASS = YES_ERROR;
-\t\t\t\tCLANG_WARN_QUOTED_INCLUDE_IN_FRAMEWORK_HEADER = YES;
-\t\t\t\tCLANG_WARN_RANGE_LOOP_ANALYSIS = YES;
-\t\t\t\tCLANG_WARN_STRICT_PROTOTYPES = YES;
-\t\t\t\tCLANG_WARN_SUSPICIOUS_MOVE = YES;
-\t\t\t\tCLANG_WARN_UNGUARDED_AVAILABILITY = YES_AGGRESSIVE;
-\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;
-\t\t\t\tCLANG_WARN__DUPLICATE_METHOD_MATCH = YES;
-\t\t\t\tCOPY_PHASE_STRIP = NO;
-\t\t\t\tDEBUG_INFORMATION_FORMAT = dwarf;
-\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;
-\t\t\t\tENABLE_TESTABILITY = YES;
-\t\t\t\tENABLE_USER_SCRIPT_SANDBOXING = YES;
-\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu17;
-\t\t\t\tGCC_DYNAMIC_NO_PIC = NO;
-\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;
-\t\t\t\tGCC_OPTIMIZATION_LEVEL = 0;
-\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (
-\t\t\t\t\t"DEBUG=1",
-\t\t\t\t\t"$(inherited)",
-\t\t\t\t);
-\t\t\t\tGCC_WARN_64_TO_32_BIT_CONVERSION = YES;
-\t\t\t\tGCC_WARN_ABOUT_RETURN_TYPE = YES_ERROR;
-\t\t\t\tGCC_WARN_UNDECLARED_SELECTOR = YES;
-\t\t\t\tGCC_WARN_UNINITIALIZED_AUTOS = YES_AGGRESSIVE;
-\t\t\t\tGCC_WARN_UNUSED_FUNCTION = YES;
-\t\t\t\tGCC_WARN_UNUSED_VARIABLE = YES;
-\t\t\t\tIPHONEOS_DEPLOYMENT_TARGET = 17.0;
-\t\t\t\tLOCALIZATION_PREFERS_STRING_CATALOGS = YES;
-\t\t\t\tMTL_ENABLE_DEBUG_INFO = INCLUDE_SOURCE;
-\t\t\t\tMTL_FAST_MATH = YES;
-\t\t\t\tONLY_ACTIVE_ARCH = YES;
-\t\t\t\tSDKROOT = iphoneos;
-\t\t\t\tSWIFT_ACTIVE_COMPILATION_CONDITIONS = "DEBUG $(inherited)";
-\t\t\t\tSWIFT_OPTIMIZATION_LEVEL = "-Onone";
-\t\t\t}};
-\t\t\tname = Debug;
+{settings}\t\t\t}};
+\t\t\tname = {quoted_name};
 \t\t}};
-\t\t{release_config_id} /* Release */ = {{
-\t\t\tisa = XCBuildConfiguration;
-\t\t\tbuildSettings = {{
-\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;
-\t\t\t\tASYNC_AWAIT_CHECKING = YES;
-\t\t\t\tCLANG_ANALYZER_NONNULL = YES;
-\t\t\t\tCLANG_ANALYZER_NUMBER_OBJECT_CONVERSION = YES_AGGRESSIVE;
-\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = "gnu++20";
-\t\t\t\tCLANG_ENABLE_MODULES = YES;
-\t\t\t\tCLANG_ENABLE_OBJC_ARC = YES;
-\t\t\t\tCLANG_ENABLE_OBJC_WEAK = YES;
-\t\t\t\tCLANG_WARN_BLOCK_CAPTURE_AUTORELEASING = YES;
-\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_COMMA = YES;
-\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_DEPRECATED_OBJC_IMPLEMENTATIONS = YES;
-\t\t\t\tCLANG_WARN_DIRECT_OBJC_ISA_USAGE = YES_ERROR;
-\t\t\t\tCLANG_WARN_DOCUMENTATION_COMMENTS = YES;
-\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;
-\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_INFINITE_RECURSION = YES;
-\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_NON_LITERAL_NULL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_OBJC_IMPLICIT_RETAIN_SELF = YES;
-\t\t\t\tCLANG_WARN_OBJC_LITERAL_CONVERSION = YES;
-\t\t\t\tCLANG_WARN_OBJC_ROOT_CLASS = YES_ERROR;
-\t\t\t\tCLANG_WARN_QUOTED_INCLUDE_IN_FRAMEWORK_HEADER = YES;
-\t\t\t\tCLANG_WARN_RANGE_LOOP_ANALYSIS = YES;
-\t\t\t\tCLANG_WARN_STRICT_PROTOTYPES = YES;
-\t\t\t\tCLANG_WARN_SUSPICIOUS_MOVE = YES;
-\t\t\t\tCLANG_WARN_UNGUARDED_AVAILABILITY = YES_AGGRESSIVE;
-\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;
-\t\t\t\tCLANG_WARN__DUPLICATE_METHOD_MATCH = YES;
-\t\t\t\tCOPY_PHASE_STRIP = NO;
-\t\t\t\tDEBUG_INFORMATION_FORMAT = "dwarf-with-dsym";
-\t\t\t\tENABLE_NS_ASSERTIONS = NO;
-\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;
-\t\t\t\tENABLE_USER_SCRIPT_SANDBOXING = YES;
-\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu17;
-\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;
-\t\t\t\tGCC_WARN_64_TO_32_BIT_CONVERSION = YES;
-\t\t\t\tGCC_WARN_ABOUT_RETURN_TYPE = YES_ERROR;
-\t\t\t\tGCC_WARN_UNDECLARED_SELECTOR = YES;
-\t\t\t\tGCC_WARN_UNINITIALIZED_AUTOS = YES_AGGRESSIVE;
-\t\t\t\tGCC_WARN_UNUSED_FUNCTION = YES;
-\t\t\t\tGCC_WARN_UNUSED_VARIABLE = YES;
-\t\t\t\tIPHONEOS_DEPLOYMENT_TARGET = 17.0;
-\t\t\t\tLOCALIZATION_PREFERS_STRING_CATALOGS = YES;
-\t\t\t\tMTL_ENABLE_DEBUG_INFO = NO;
-\t\t\t\tMTL_FAST_MATH = YES;
-\t\t\t\tSDKROOT = iphoneos;
-\t\t\t\tSWIFT_COMPILATION_MODE = wholemodule;
-\t\t\t\tVALIDATE_PRODUCT = YES;
-\t\t\t}};
-\t\t\tname = Release;
-\t\t}};
-\t\t{debug_config_target_id} /* Debug */ = {{
-\t\t\tisa = XCBuildConfiguration;
-\t\t\tbuildSettings = {{
-\t\t\t\tASSETCATALOG_COMPILER_APPICON_NAME = AppIcon;
-\t\t\t\tASSETCATALOG_COMPILER_GLOBAL_ACCENT_COLOR_NAME = AccentColor;
-\t\t\t\tCODE_SIGN_STYLE = Automatic;
-\t\t\t\tCURRENT_PROJECT_VERSION = 1;
-\t\t\t\tDEVELOPMENT_ASSET_PATHS = "";
-\t\t\t\tENABLE_PREVIEWS = YES;
-\t\t\t\tGENERATE_INFOPLIST_FILE = NO;
-\t\t\t\tINFOPLIST_FILE = Info.plist;
-\t\t\t\tINFOPLIST_KEY_UIApplicationSceneManifest_Generation = YES;
-\t\t\t\tINFOPLIST_KEY_UIApplicationSupportsIndirectInputEvents = YES;
-\t\t\t\tINFOPLIST_KEY_UILaunchScreen_Generation = YES;
-\t\t\t\tINFOPLIST_KEY_UISupportedInterfaceOrientations_iPad = "UIInterfaceOrientationPortrait UIInterfaceOrientationPortraitUpsideDown UIInterfaceOrientationLandscapeLeft UIInterfaceOrientationLandscapeRight";
-\t\t\t\tINFOPLIST_KEY_UISupportedInterfaceOrientations_iPhone = "UIInterfaceOrientationPortrait UIInterfaceOrientationLandscapeLeft UIInterfaceOrientationLandscapeRight";
-\t\t\t\tLD_RUNPATH_SEARCH_PATHS = (
-\t\t\t\t\t"$(inherited)",
-\t\t\t\t\t"@executable_path/Frameworks",
-\t\t\t\t);
-\t\t\t\tMARKETING_VERSION = 1.0;
-\t\t\t\tPRODUCT_BUNDLE_IDENTIFIER = com.opsbrain.TenX;
-\t\t\t\tPRODUCT_NAME = "$(TARGET_NAME)";
-\t\t\t\tSWIFT_EMIT_LOC_STRINGS = YES;
-\t\t\t\tSWIFT_VERSION = 5.0;
-\t\t\t\tTARGETED_DEVICE_FAMILY = "1,2";
-\t\t\t}};
-\t\t\tname = Debug;
-\t\t}};
-\t\t{release_config_target_id} /* Release */ = {{
-\t\t\tisa = XCBuildConfiguration;
-\t\t\tbuildSettings = {{
-\t\t\t\tASSETCATALOG_COMPILER_APPICON_NAME = AppIcon;
-\t\t\t\tASSETCATALOG_COMPILER_GLOBAL_ACCENT_COLOR_NAME = AccentColor;
-\t\t\t\tCODE_SIGN_STYLE = Automatic;
-\t\t\t\tCURRENT_PROJECT_VERSION = 1;
-\t\t\t\tDEVELOPMENT_ASSET_PATHS = "";
-\t\t\t\tENABLE_PREVIEWS = YES;
-\t\t\t\tGENERATE_INFOPLIST_FILE = NO;
-\t\t\t\tINFOPLIST_FILE = Info.plist;
-\t\t\t\tINFOPLIST_KEY_UIApplicationSceneManifest_Generation = YES;
-\t\t\t\tINFOPLIST_KEY_UIApplicationSupportsIndirectInputEvents = YES;
-\t\t\t\tINFOPLIST_KEY_UILaunchScreen_Generation = YES;
-\t\t\t\tINFOPLIST_KEY_UISupportedInterfaceOrientations_iPad = "UIInterfaceOrientationPortrait UIInterfaceOrientationPortraitUpsideDown UIInterfaceOrientationLandscapeLeft UIInterfaceOrientationLandscapeRight";
-\t\t\t\tINFOPLIST_KEY_UISupportedInterfaceOrientations_iPhone = "UIInterfaceOrientationPortrait UIInterfaceOrientationLandscapeLeft UIInterfaceOrientationLandscapeRight";
-\t\t\t\tLD_RUNPATH_SEARCH_PATHS = (
-\t\t\t\t\t"$(inherited)",
-\t\t\t\t\t"@executable_path/Frameworks",
-\t\t\t\t);
-\t\t\t\tMARKETING_VERSION = 1.0;
-\t\t\t\tPRODUCT_BUNDLE_IDENTIFIER = com.opsbrain.TenX;
-\t\t\t\tPRODUCT_NAME = "$(TARGET_NAME)";
-\t\t\t\tSWIFT_EMIT_LOC_STRINGS = YES;
-\t\t\t\tSWIFT_VERSION = 5.0;
-\t\t\t\tTARGETED_DEVICE_FAMILY = "1,2";
-\t\t\t}};
-\t\t\tname = Release;
-\t\t}};
-/* End XCBuildConfiguration section */
+"""
 
-/* Begin XCConfigurationList section */
-\t\t{config_list_project_id} /* Build configuration list for PBXProject "TenX" */ = {{
+_CONFIGURATION_LIST = """\t\t{id} /* Build configuration list for {isa} "{name}" */ = {{
 \t\t\tisa = XCConfigurationList;
 \t\t\tbuildConfigurations = (
-\t\t\t\t{debug_config_id} /* Debug */,
-\t\t\t\t{release_config_id} /* Release */,
-\t\t\t);
+{configurations}\t\t\t);
 \t\t\tdefaultConfigurationIsVisible = 0;
-\t\t\tdefaultConfigurationName = Release;
+\t\t\tdefaultConfigurationName = {default};
 \t\t}};
-\t\t{config_list_target_id} /* Build configuration list for PBXNativeTarget "TenX" */ = {{
-\t\t\tisa = XCConfigurationList;
-\t\t\tbuildConfigurations = (
-\t\t\t\t{debug_config_target_id} /* Debug */,
-\t\t\t\t{release_config_target_id} /* Release */,
+"""
+
+def _settings_text(settings, rendered):
+    """buildSettings body, sorted by key; identical dictionaries are rendered once"""
+    key = json.dumps(settings, sort_keys=True)
+    text = rendered.get(key)
+    if text is None:
+        lines = []
+        for name in sorted(settings):
+            value = settings[name]
+            if isinstance(value, list):
+                lines.append(f"\t\t\t\t{name} = (\n")
+                lines.extend(f"\t\t\t\t\t{quote(str(item))},\n" for item in value)
+                lines.append("\t\t\t\t);\n")
+            else:
+                lines.append(f"\t\t\t\t{name} = {quote(str(value))};\n")
+        text = rendered[key] = "".join(lines)
+    return text
+
+# Section emitters: each yields the text of one section of the objects
+# dictionary, so the project is streamed to disk without building it in memory
+
+def _section(name, chunks):
+    yield f"\n/* Begin {name} section */\n"
+    yield from chunks
+    yield f"/* End {name} section */\n"
+
+def _build_files(plan):
+    for target in plan.targets:
+        for build_id, f in target.sources:
+            yield f"\t\t{build_id} /* {f.name} in Sources */ = {{isa = PBXBuildFile; fileRef = {f.ref_id} /* {f.name} */; }};\n"
+        for build_id, dependency in target.frameworks:
+            product = dependency.target.product
+            yield f"\t\t{build_id} /* {product} in Frameworks */ = {{isa = PBXBuildFile; fileRef = {dependency.product_id} /* {product} */; }};\n"
+        for build_id, f in target.resources:
+            yield f"\t\t{build_id} /* {f.name} in Resources */ = {{isa = PBXBuildFile; fileRef = {f.ref_id} /* {f.name} */; }};\n"
+
+def _container_proxies(plan):
+    for target in plan.targets:
+        for _, proxy_id, dependency in target.dependencies:
+            yield _CONTAINER_PROXY.format(id=proxy_id, project=plan.project_id, target=dependency.id,
+                                          quoted_name=quote(dependency.target.name))
+
+def _file_refs(plan):
+    for f in plan.files:
+        yield f"\t\t{f.ref_id} /* {f.name} */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = {quote(f.name)}; sourceTree = \"<group>\"; }};\n"
+    for target in plan.targets:
+        product = target.target.product
+        file_type = TARGET_TYPES[target.target.type][1]
+        yield f"\t\t{target.product_id} /* {product} */ = {{isa = PBXFileReference; explicitFileType = {file_type}; includeInIndex = 0; path = {quote(product)}; sourceTree = BUILT_PRODUCTS_DIR; }};\n"
+    # Resources, then Info.plists
+    for f in sorted(plan.extra_files, key=lambda f: f.type == "text.plist.xml"):
+        yield f"\t\t{f.ref_id} /* {f.name} */ = {{isa = PBXFileReference; lastKnownFileType = {f.type}; path = {quote(f.path)}; sourceTree = \"<group>\"; }};\n"
+
+def _phases(plan, role, isa, name):
+    for target in plan.targets:
+        yield _PHASE_HEAD.format(id=target.phase_ids[role], name=name, isa=isa)
+        if role == "sources_build_phase":
+            for build_id, f in target.sources:
+                yield f"\t\t\t\t{build_id} /* {f.name} in Sources */,\n"
+        elif role == "frameworks_build_phase":
+            for build_id, dependency in target.frameworks:
+                yield f"\t\t\t\t{build_id} /* {dependency.target.product} in Frameworks */,\n"
+        else:
+            for build_id, f in target.resources:
+                yield f"\t\t\t\t{build_id} /* {f.name} in Resources */,\n"
+        yield _PHASE_TAIL
+
+def _group_children(group):
+    for child in group.groups:
+        yield f"\t\t\t\t{child.id} /* {child.name} */,\n"
+    for f in group.files:
+        yield f"\t\t\t\t{f.ref_id} /* {f.name} */,\n"
+
+def _groups(plan):
+    ids = plan.ids
+    products_group_id = ids("products_group")
+    yield f"\t\t{ids('main_group')} = {{\n\t\t\tisa = PBXGroup;\n\t\t\tchildren = (\n"
+    for f in plan.extra_files:
+        yield f"\t\t\t\t{f.ref_id} /* {f.name} */,\n"
+    yield from _group_children(plan.tree)
+    yield f"""\t\t\t\t{products_group_id} /* Products */,
 \t\t\t);
-\t\t\tdefaultConfigurationIsVisible = 0;
-\t\t\tdefaultConfigurationName = Release;
+\t\t\tsourceTree = "<group>";
 \t\t}};
-/* End XCConfigurationList section */
-\t}};
-\trootObject = {target_id} /* Project object */;
+\t\t{products_group_id} /* Products */ = {{
+\t\t\tisa = PBXGroup;
+\t\t\tchildren = (
+"""
+    for target in plan.targets:
+        yield f"\t\t\t\t{target.product_id} /* {target.target.product} */,\n"
+    yield """\t\t\t);
+\t\t\tname = Products;
+\t\t\tsourceTree = "<group>";
+\t\t};
+"""
+    # Source groups in depth-first order, each directly after its parent
+    stack = list(reversed(plan.tree.groups))
+    while stack:
+        group = stack.pop()
+        yield f"\t\t{group.id} /* {group.name} */ = {{\n\t\t\tisa = PBXGroup;\n\t\t\tchildren = (\n"
+        yield from _group_children(group)
+        yield f"\t\t\t);\n\t\t\tpath = {quote(group.name)};\n\t\t\tsourceTree = \"<group>\";\n\t\t}};\n"
+        stack.extend(reversed(group.groups))
+
+def _native_targets(plan):
+    for target in plan.targets:
+        yield _NATIVE_TARGET.format(
+            id=target.id,
+            name=target.target.name,
+            quoted_name=quote(target.target.name),
+            config_list=target.config_list_id,
+            sources=target.phase_ids["sources_build_phase"],
+            frameworks=target.phase_ids["frameworks_build_phase"],
+            resources=target.phase_ids["resources_build_phase"],
+            dependencies="".join(f"\t\t\t\t{dependency_id} /* PBXTargetDependency */,\n"
+                                 for dependency_id, _, _ in target.dependencies),
+            product_id=target.product_id,
+            product=target.target.product,
+            product_type=TARGET_TYPES[target.target.type][0],
+        )
+
+def _project(plan):
+    yield _PROJECT.format(
+        id=plan.project_id,
+        name=plan.spec.name,
+        config_list=plan.config_list_id,
+        main_group=plan.ids("main_group"),
+        products_group=plan.ids("products_group"),
+        target_attributes="".join(_TARGET_ATTRIBUTES.format(id=target.id) for target in plan.targets),
+        targets="".join(f"\t\t\t\t{target.id} /* {target.target.name} */,\n" for target in plan.targets),
+    )
+
+def _target_dependencies(plan):
+    for target in plan.targets:
+        for dependency_id, proxy_id, dependency in target.dependencies:
+            yield _TARGET_DEPENDENCY.format(id=dependency_id, target=dependency.id,
+                                            name=dependency.target.name, proxy=proxy_id)
+
+def _configurations(plan):
+    rendered = {}
+    configurations = [(plan.config_ids, plan.spec.settings)]
+    configurations += [(target.config_ids, target.target.settings) for target in plan.targets]
+    for config_ids, settings in configurations:
+        for name in plan.spec.configurations:
+            yield _CONFIGURATION.format(id=config_ids[name], name=name, quoted_name=quote(name),
+                                        settings=_settings_text(settings[name], rendered))
+
+def _configuration_lists(plan):
+    lists = [(plan.config_list_id, "PBXProject", plan.spec.name, plan.config_ids)]
+    lists += [(target.config_list_id, "PBXNativeTarget", target.target.name, target.config_ids)
+              for target in plan.targets]
+    for list_id, isa, name, config_ids in lists:
+        yield _CONFIGURATION_LIST.format(
+            id=list_id,
+            isa=isa,
+            name=name,
+            configurations="".join(f"\t\t\t\t{config_ids[config]} /* {config} */,\n"
+                                   for config in plan.spec.configurations),
+            default=quote(plan.spec.default_configuration),
+        )
+
+def project_chunks(plan):
+    """The whole project file as a stream of text chunks"""
+    yield """// !$*UTF8*$!
+{
+\tarchiveVersion = 1;
+\tclasses = {
+\t};
+\tobjectVersion = 56;
+\tobjects = {
+"""
+    has_dependencies = any(target.dependencies for target in plan.targets)
+    yield from _section("PBXBuildFile", _build_files(plan))
+    if has_dependencies:
+        yield from _section("PBXContainerItemProxy", _container_proxies(plan))
+    yield from _section("PBXFileReference", _file_refs(plan))
+    yield from _section("PBXFrameworksBuildPhase",
+                        _phases(plan, "frameworks_build_phase", "PBXFrameworksBuildPhase", "Frameworks"))
+    yield from _section("PBXGroup", _groups(plan))
+    yield from _section("PBXNativeTarget", _native_targets(plan))
+    yield from _section("PBXProject", _project(plan))
+    yield from _section("PBXResourcesBuildPhase",
+                        _phases(plan, "resources_build_phase", "PBXResourcesBuildPhase", "Resources"))
+    yield from _section("PBXSourcesBuildPhase",
+                        _phases(plan, "sources_build_phase", "PBXSourcesBuildPhase", "Sources"))
+    if has_dependencies:
+        yield from _section("PBXTargetDependency", _target_dependencies(plan))
+    yield from _section("XCBuildConfiguration", _configurations(plan))
+    yield from _section("XCConfigurationList", _configuration_lists(plan))
+    yield f"""\t}};
+\trootObject = {plan.project_id} /* Project object */;
 }}
 """
+
+def modular_spec(spec, base_path, swift_files):
+    """spec with framework targets split off its app by swift_deps"""
+    from swift_deps import analyze, split_spec
+
+    app = next(target.name for target in spec.targets if target.type == "application")
+    return build_spec(split_spec(spec.data, analyze(base_path, swift_files), app))
+
+def create_project(base_path=BASE_PATH, reuse_ids=True, quiet=False, spec=None, modules=False, ids=None):
+    """Write the project for base_path; returns its .xcodeproj path
+
+    ids, when given, is an ObjectIds to use instead of reading the IDs of
+    the existing project file again.
+    """
+    spec = spec or load_spec(SPEC_PATH)
+    project_dir = os.path.join(base_path, f"{spec.name}.xcodeproj")
+    project_file = os.path.join(project_dir, "project.pbxproj")
     
-    # Write the project file
-    project_dir = os.path.join(base_path, "TenX.xcodeproj")
-    os.makedirs(project_dir, exist_ok=True)
+    # Find all Swift files
+    with stage("discover"):
+        os.makedirs(project_dir, exist_ok=True)
+        swift_files = find_swift_files(base_path, os.path.join(project_dir, ".source_index.json"))
     
-    project_file = os.path.join(project_dir, "project.pbxproj")
-    with open(project_file, 'w') as f:
-        f.write(project_content)
+    # Framework targets from the source dependency graph
+    if modules:
+        with stage("modules"):
+            spec = modular_spec(spec, base_path, swift_files)
     
-    print(f"✅ Created Xcode project at: {project_dir}")
-    print(f"📝 Found {len(swift_files)} Swift files")
+    # Object IDs: reused from the current project file, or stable hashes
+    with stage("ids"):
+        if ids is None:
+            ids = ObjectIds(existing_ids(project_file) if reuse_ids else None)
+    
+    # Target membership and nested groups mirroring the directory layout
+    with stage("plan"):
+        plan = plan_project(spec, swift_files, ids)
+    
+    # Stream the sections into the project file, unless it already holds
+    # exactly this content
+    with stage("write"):
+        written = _write_if_changed(project_file, project_chunks(plan))
+        mark_stable_ids(project_file, not ids.existing)
+    
+    # Catch duplicate IDs and broken references before Xcode does; reported
+    # even when quiet, since the project will not open
+    if written:
+        with stage("validate"):
+            issues = validate_file(project_file)
+        for issue in issues:
+            print(f"❌ {issue.kind}: {issue.message}")
+    
+    if quiet:
+        return project_dir
+    if written:
+        print(f"✅ Created Xcode project at: {project_dir}")
+    else:
+        print(f"✅ Xcode project is up to date: {project_dir}")
+    print(f"📝 Found {len(plan.files)} Swift files in {len(plan.targets)} targets")
     print("\nYou can now open the project with:")
     print(f"  open '{project_dir}'")
     
     return project_dir
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate the TenX Xcode project")
+    parser.add_argument("--root", default=BASE_PATH, help="project source directory")
+    parser.add_argument("--spec", default=SPEC_PATH, help="project spec (.json or .toml)")
+    parser.add_argument("--modules", action="store_true",
+                        help="split the app into framework targets along its source dependencies")
+    parser.add_argument("--fresh-ids", action="store_true",
+                        help="ignore IDs in the existing project file and use stable hashes only")
+    parser.add_argument("--trace", default=None, help="write a Chrome trace of the run to this file")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and regenerate whenever Swift files are added or removed")
+    parser.add_argument("--poll", action="store_true",
+                        help="with --watch, poll the directory index instead of using inotify")
+    args = parser.parse_args()
+    spec = load_spec(args.spec)
+    with traced(args.trace):
+        create_project(args.root, reuse_ids=not args.fresh_ids, spec=spec, modules=args.modules)
+    if args.watch:
+        watch_project(args.root, poll=args.poll, spec=spec, modules=args.modules)
+
+def watch_project(base_path=BASE_PATH, poll=False, spec=None, modules=False):
+    """Regenerate the project after every burst of Swift file changes
+
+    The existing project file is parsed for its IDs once, when the watch
+    starts. Every ID written afterwards is one of those or a stable_id(), so
+    regenerating does not need to parse the file again.
+    """
+    from xcode_watch import watch
+    spec = spec or load_spec(SPEC_PATH)
+    ids = ObjectIds(existing_ids(os.path.join(base_path, f"{spec.name}.xcodeproj", "project.pbxproj")))
+
+    def regenerate():
+        start = time.perf_counter()
+        create_project(base_path, quiet=True, spec=spec, modules=modules, ids=ids)
+        print(f"🔄 Regenerated in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    watch(base_path, regenerate, poll=poll)
+
 if __name__ == "__main__":
-    create_project()
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage-timing hooks for the TenX generator scripts
+
+Code marks its phases with `with stage("name"):`. Nothing is recorded
+unless a recorder is active, so the hooks cost next to nothing in normal
+runs. Two recorders exist:
+
+- StageRecorder totals seconds and calls per stage (used by the benchmark)
+- Tracer keeps every span with wall time, CPU time and, optionally, the
+  tracemalloc peak, and exports them as a Chrome trace (chrome://tracing,
+  Perfetto)
+
+The scripts enable a Tracer through traced(), which is a no-op unless a
+trace path is given on the command line or in $TENX_TRACE.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+TRACE_ENV = "TENX_TRACE"
+TRACE_MEMORY_ENV = "TENX_TRACE_MEMORY"
+
+# start is perf_counter seconds; peak_bytes is the tracemalloc peak above the
+# allocation at span start, or None when memory is not traced.
+Span = namedtuple("Span", "name start wall cpu peak_bytes")
+
+_recorders = []
+# Per open span: the highest peak seen before its children reset the counter
+_peaks = []
+
+def _memory_traced():
+    return tracemalloc.is_tracing() and any(recorder.memory for recorder in _recorders)
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block under name for every active recorder"""
+    if not _recorders:
+        yield
+        return
+    memory = _memory_traced()
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if _peaks:
+            _peaks[-1] = max(_peaks[-1], peak)
+        tracemalloc.reset_peak()
+        _peaks.append(current)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        peak_bytes = None
+        if memory:
+            peak = max(_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if _peaks:
+                _peaks[-1] = max(_peaks[-1], peak)
+            peak_bytes = peak - current
+        span = Span(name, start, wall, cpu, peak_bytes)
+        for recorder in list(_recorders):
+            recorder.add_span(span)
+
+class _Recorder:
+    memory = False
+
+    def __enter__(self):
+        _recorders.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _recorders.remove(self)
+        return False
+
+class StageRecorder(_Recorder):
+    """Collect total seconds and call counts per stage while active
+
+        with StageRecorder() as recorder:
+            create_tenx_logo(1024)
+        recorder.as_dict()  # {"glow": {"seconds": ..., "calls": 1}, ...}
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, name, elapsed):
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def add_span(self, span):
+        self.add(span.name, span.wall)
+
+    def as_dict(self):
+        return {
+            name: {"seconds": self.seconds[name], "calls": self.calls[name]}
+            for name in self.seconds
+        }
+
+class Tracer(_Recorder):
+    """Keep every span while active and export them as a Chrome trace
+
+    With memory=True tracemalloc runs for the lifetime of the tracer (unless
+    it was already running) and each span records its allocation peak.
+    Tracing memory slows allocation-heavy code down noticeably, so the
+    reported wall times are then only comparable with each other.
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.spans = []
+        self.origin = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def add_span(self, span):
+        self.spans.append(span)
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.origin = time.perf_counter()
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def chrome_trace(self):
+        """Trace Event Format dict: one complete ("X") event per span"""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": tid,
+                   "args": {"name": os.path.basename(sys.argv[0]) or "python"}}]
+        for span in sorted(self.spans, key=lambda span: (span.start, -span.wall)):
+            args = {"cpu_ms": round(span.cpu * 1000, 3)}
+            if span.peak_bytes is not None:
+                args["peak_bytes"] = span.peak_bytes
+            events.append({
+                "name": span.name,
+                "cat": "tenx",
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 1),
+                "dur": round(span.wall * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Write the Chrome trace JSON to path"""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self):
+        """Per-stage totals as text lines, slowest first"""
+        totals = {}
+        for span in self.spans:
+            wall, cpu, calls, peak = totals.get(span.name, (0.0, 0.0, 0, None))
+            if span.peak_bytes is not None:
+                peak = max(peak or 0, span.peak_bytes)
+            totals[span.name] = (wall + span.wall, cpu + span.cpu, calls + 1, peak)
+        lines = []
+        for name, (wall, cpu, calls, peak) in sorted(totals.items(), key=lambda item: -item[1][0]):
+            memory = f"  peak {peak / 1e6:8.1f} MB" if peak is not None else ""
+            lines.append(f"{name:>16} {wall * 1000:9.1f} ms wall {cpu * 1000:9.1f} ms cpu "
+                         f"x{calls}{memory}")
+        return lines
+
+@contextmanager
+def traced(path=None):
+    """Trace the enclosed block when path or $TENX_TRACE names a trace file
+
+    Yields the active Tracer, or None when tracing is off. On exit the
+    Chrome trace is written and a per-stage summary goes to stderr. Set
+    $TENX_TRACE_MEMORY=0 to skip tracemalloc.
+    """
+    path = path or os.environ.get(TRACE_ENV)
+    if not path:
+        yield None
+        return
+    tracer = Tracer(memory=os.environ.get(TRACE_MEMORY_ENV, "1") != "0")
+    try:
+        with tracer:
+            yield tracer
+    finally:
+        tracer.write(path)
+        print(f"Trace written to {path}", file=sys.stderr)
+        for line in tracer.summary():
+            print(line, file=sys.stderr)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of rendered icons into an Xcode .appiconset
+"""
+
+import json
+import os
+import tempfile
+from collections import namedtuple
+
+DEFAULT_APPICONSET = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Assets.xcassets", "AppIcon.appiconset"
+)
+
+# Appearances Xcode accepts as luminosity variants of an app icon slot
+APPEARANCES = ("dark", "tinted")
+
+Slot = namedtuple("Slot", "idiom size scale")
+SyncReport = namedtuple("SyncReport", "written unchanged removed")
+
+# Every iPhone/iPad app icon slot (TARGETED_DEVICE_FAMILY = "1,2")
+IOS_SLOTS = [
+    Slot("iphone", 20, 2), Slot("iphone", 20, 3),
+    Slot("iphone", 29, 2), Slot("iphone", 29, 3),
+    Slot("iphone", 40, 2), Slot("iphone", 40, 3),
+    Slot("iphone", 60, 2), Slot("iphone", 60, 3),
+    Slot("ipad", 20, 1), Slot("ipad", 20, 2),
+    Slot("ipad", 29, 1), Slot("ipad", 29, 2),
+    Slot("ipad", 40, 1), Slot("ipad", 40, 2),
+    Slot("ipad", 76, 1), Slot("ipad", 76, 2),
+    Slot("ipad", 83.5, 2),
+    Slot("ios-marketing", 1024, 1),
+]
+
+def pixel_size(slot):
+    """Pixel width of the image that fills a slot"""
+    return int(round(slot.size * slot.scale))
+
+def slot_pixel_sizes(slots=IOS_SLOTS):
+    """Distinct pixel sizes needed to fill every slot, largest first"""
+    return sorted({pixel_size(slot) for slot in slots}, reverse=True)
+
+def icon_filename(pixels, appearance=None):
+    """File name of the icon image for a pixel size (and appearance)"""
+    if appearance:
+        return f"AppIcon-{appearance}-{pixels}x{pixels}.png"
+    return f"AppIcon-{pixels}x{pixels}.png"
+
+def _points(size):
+    return f"{size:g}x{size:g}"
+
+def contents_json(rendered_sizes, slots=IOS_SLOTS, appearances=None):
+    """Contents.json dict listing every slot whose pixel size was rendered
+
+    appearances maps appearance names ("dark", "tinted") to the pixel sizes
+    rendered for them; each gets its own entry per slot with a luminosity
+    `appearances` list, right after the slot's default entry.
+    """
+    images = []
+    for slot in slots:
+        pixels = pixel_size(slot)
+        if pixels not in rendered_sizes:
+            continue
+        entry = {
+            "filename": icon_filename(pixels),
+            "idiom": slot.idiom,
+            "scale": f"{slot.scale}x",
+            "size": _points(slot.size),
+        }
+        images.append(entry)
+        for appearance in APPEARANCES:
+            if pixels in (appearances or {}).get(appearance, ()):
+                images.append(dict(
+                    entry,
+                    filename=icon_filename(pixels, appearance),
+                    appearances=[{"appearance": "luminosity", "value": appearance}],
+                ))
+    return {"images": images, "info": {"author": "xcode", "version": 1}}
+
+def encode_contents(contents):
+    """Serialize Contents.json the way Xcode writes it"""
+    return (json.dumps(contents, indent=2, sort_keys=True, separators=(",", " : ")) + "\n").encode()
+
+def _unchanged(path, data):
+    """True when path already holds exactly data (size check before reading)"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+def write_atomic(path, data):
+    """Write data via a temp file in the same directory and rename over path"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def sync_files(directory, files, prune_prefix="AppIcon-"):
+    """Make directory hold files ({name: bytes}), rewriting only what changed
+
+    Files whose bytes already match are left alone (mtime included), changed
+    files are replaced atomically, and stale PNGs starting with prune_prefix
+    that are no longer listed are removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written, unchanged, removed = [], [], []
+    for name in sorted(files):
+        path = os.path.join(directory, name)
+        if _unchanged(path, files[name]):
+            unchanged.append(name)
+        else:
+            write_atomic(path, files[name])
+            written.append(name)
+    if prune_prefix:
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(prune_prefix) and name.endswith(".png") and name not in files:
+                os.remove(os.path.join(directory, name))
+                removed.append(name)
+    return SyncReport(written, unchanged, removed)
+
+def sync_appiconset(appiconset, pngs, slots=IOS_SLOTS, appearances=None):
+    """Sync {pixel_size: png_bytes} plus a generated Contents.json into appiconset
+
+    appearances optionally maps "dark" / "tinted" to their own
+    {pixel_size: png_bytes}, written next to the default images.
+    """
+    appearances = appearances or {}
+    files = {icon_filename(pixels): data for pixels, data in pngs.items()}
+    for appearance, images in appearances.items():
+        files.update({icon_filename(pixels, appearance): data for pixels, data in images.items()})
+    contents = contents_json(set(pngs), slots, {name: set(images) for name, images in appearances.items()})
+    files["Contents.json"] = encode_contents(contents)
+    return sync_files(appiconset, files)
+
+def alternate_appiconset(name, appiconset=DEFAULT_APPICONSET):
+    """Sibling icon set for an alternate icon: AppIcon.appiconset -> AppIcon-Name.appiconset"""
+    base, extension = os.path.splitext(appiconset.rstrip(os.sep))
+    return f"{base}-{name.capitalize()}{extension}"
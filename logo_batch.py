@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Render TenX icon sets and variants in parallel across a process pool
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from logo_export import PROFILES, export_png
+
+# Short renderer names mapped to "module:function" so jobs stay picklable
+RENDERERS = {
+    "logo": "create_logo:create_tenx_logo",
+    "simple": "create_simple_logo:create_tenx_logo",
+}
+
+RenderJob = namedtuple("RenderJob", "renderer size variant output_path profile", defaults=("default",))
+JobResult = namedtuple("JobResult", "job ok seconds error")
+
+def output_name(renderer, size, variant=None):
+    """Deterministic file name for a (renderer, size, variant) job"""
+    if variant:
+        return f"{renderer}-{variant}-{size}x{size}.png"
+    return f"{renderer}-{size}x{size}.png"
+
+def resolve_renderer(name):
+    """Import the render function for a short name or "module:function" path"""
+    module_name, _, func_name = RENDERERS.get(name, name).partition(":")
+    return getattr(importlib.import_module(module_name), func_name or "create_tenx_logo")
+
+def takes_variant(renderer):
+    """Whether a renderer's function has a variant parameter"""
+    return "variant" in inspect.signature(resolve_renderer(renderer)).parameters
+
+def make_jobs(renderers, sizes, variants, output_dir, profile="default"):
+    """Expand renderer x variant x size into jobs with deterministic paths
+
+    Renderers without a variant parameter get a single default (None)
+    variant instead of variants they could not render.
+    """
+    return [
+        RenderJob(renderer, size, variant,
+                  os.path.join(output_dir, output_name(renderer, size, variant)), profile)
+        for renderer in renderers
+        for variant in (variants if takes_variant(renderer) else [None])
+        for size in sizes
+    ]
+
+def run_job(job):
+    """Render and save a single job, returning a JobResult instead of raising"""
+    start = time.perf_counter()
+    try:
+        render = resolve_renderer(job.renderer)
+        img = render(job.size, variant=job.variant) if job.variant else render(job.size)
+        export_png(img, job.output_path, job.profile)
+        return JobResult(job, True, time.perf_counter() - start, None)
+    except Exception:
+        return JobResult(job, False, time.perf_counter() - start, traceback.format_exc())
+
+def render_batch(jobs, workers=None):
+    """Run jobs across a process pool and return results in job order
+
+    workers defaults to the machine's CPU count. With a single worker (or a
+    single job) everything runs in-process, which avoids pool start-up cost.
+    """
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        return [run_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_job, jobs, chunksize=chunksize))
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-render TenX icon variants")
+    parser.add_argument("--renderer", action="append", choices=sorted(RENDERERS),
+                        help="renderer to use (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1024, 512, 256, 180, 120, 87, 80, 60, 58, 40, 29, 20])
+    parser.add_argument("--variant", action="append",
+                        help="variant name passed to the renderer (repeatable)")
+    parser.add_argument("--output-dir", default="AppIcon")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    args = parser.parse_args()
+
+    renderers = args.renderer or sorted(RENDERERS)
+    if args.variant and not any(takes_variant(renderer) for renderer in renderers):
+        parser.error(f"--variant: none of {', '.join(renderers)} renders variants")
+    jobs = make_jobs(renderers, args.sizes, args.variant or [None], args.output_dir, args.profile)
+    start = time.perf_counter()
+    results = render_batch(jobs, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if not result.ok]
+    for result in failures:
+        job = result.job
+        print(f"❌ {job.renderer} {job.size}px ({job.variant or 'default'}) -> {job.output_path}")
+        print(result.error)
+
+    print(f"{'❌' if failures else '✅'} Rendered {len(results) - len(failures)}/{len(results)} icons in {elapsed:.2f}s")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
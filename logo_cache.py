@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Content-addressed render cache for the TenX logo scripts
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from collections import OrderedDict
+
+from logo_export import write_png
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".logo_cache")
+MANIFEST_NAME = "manifest.json"
+
+def _local_modules(module, base_dir, seen):
+    """Collect module plus every module from base_dir it (transitively) uses"""
+    if module is None or module.__name__ in seen:
+        return
+    path = getattr(module, "__file__", None)
+    if not path or os.path.dirname(os.path.abspath(path)) != base_dir:
+        return
+    seen[module.__name__] = module
+    for value in vars(module).values():
+        if inspect.ismodule(value):
+            _local_modules(value, base_dir, seen)
+        elif inspect.isfunction(value) or inspect.isclass(value):
+            _local_modules(sys.modules.get(value.__module__), base_dir, seen)
+
+def source_version(render):
+    """Hash of the renderer's module and every local helper module it uses
+
+    Colors and geometry are hard-coded in these sources, so editing any of
+    them produces a new version and invalidates the cached renders.
+    """
+    module = sys.modules[render.__module__]
+    base_dir = os.path.dirname(os.path.abspath(module.__file__))
+    modules = {}
+    _local_modules(module, base_dir, modules)
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        with open(modules[name].__file__, "rb") as f:
+            digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+class RenderCache:
+    """Two-level PNG cache: in-process LRU in front of a size-bounded directory
+
+    Keys hash the renderer source version, size, variant and any extra
+    parameters (font path, palette, ...). A manifest remembers which key was
+    last written to each output path so a hit can skip the write as well.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=256 * 1024 * 1024, memory_items=64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._versions = {}
+        self._manifest = None
+        self.hits = 0
+        self.misses = 0
+        self._disk_bytes = None  # running total of the PNGs on disk, once scanned
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, render, size, variant=None, **params):
+        """Content address for one render of size (and variant) by render"""
+        if render not in self._versions:
+            self._versions[render] = source_version(render)
+        payload = json.dumps({
+            "renderer": f"{render.__module__}.{render.__qualname__}",
+            "source": self._versions[render],
+            "size": size,
+            "variant": variant,
+            "params": params,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """PNG bytes for key, or None on a miss"""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            return data
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        """Store PNG bytes under key and evict old entries past max_bytes
+
+        The directory is only scanned on the first put and when the running
+        byte total goes over max_bytes, not on every store.
+        """
+        self._remember(key, data)
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan()[1]
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._disk_bytes += len(data) - replaced
+        if self._disk_bytes > self.max_bytes:
+            self.evict()
+
+    def _scan(self):
+        """([(mtime, size, path)] of the cached PNGs, their total size)"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        return entries, total
+
+    def evict(self):
+        """Drop least recently used disk entries until under max_bytes"""
+        entries, total = self._scan()
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+        self._disk_bytes = total
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            try:
+                with open(os.path.join(self.directory, MANIFEST_NAME)) as f:
+                    self._manifest = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def save_manifest(self):
+        """Persist the output-path -> key manifest"""
+        if self._manifest is None:
+            return
+        tmp_path = os.path.join(self.directory, MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST_NAME))
+
+    def _write_output(self, key, data, output_path):
+        manifest = self._load_manifest()
+        output_path = os.path.abspath(output_path)
+        if manifest.get(output_path) == key and os.path.exists(output_path):
+            return
+        write_png(data, output_path)
+        manifest[output_path] = key
+
+    def restore(self, key, *output_paths):
+        """On a hit make sure each output path holds the cached PNG
+
+        Returns False on a miss. Nothing is rendered, and a path is not
+        rewritten when the manifest shows it already holds this key.
+        """
+        manifest = self._load_manifest()
+        if output_paths and all(
+            manifest.get(os.path.abspath(path)) == key and os.path.exists(path)
+            for path in output_paths
+        ):
+            self.hits += 1
+            return True
+        data = self.get(key)
+        if data is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        for path in output_paths:
+            self._write_output(key, data, path)
+        return True
+
+    def store(self, key, data, *output_paths):
+        """Cache freshly encoded PNG bytes and write them to each output path"""
+        self.put(key, data)
+        for path in output_paths:
+            self._write_output(key, data, path)
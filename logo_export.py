@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+PNG export stage with size/speed profiles for the TenX logo scripts
+"""
+
+import io
+import os
+import time
+from collections import namedtuple
+
+from PIL import Image
+
+from instrumentation import stage
+
+ExportProfile = namedtuple("ExportProfile", "compress_level optimize quantize_max_size")
+ExportResult = namedtuple("ExportResult", "path bytes seconds")
+
+# quantize_max_size: sizes up to this many pixels wide are palette-quantized
+# (with dithering, so gradients stay smooth) when quantization is enabled.
+# Images that already have <= 256 colors are always quantized losslessly.
+PROFILES = {
+    "fast": ExportProfile(compress_level=1, optimize=False, quantize_max_size=0),
+    "default": ExportProfile(compress_level=6, optimize=False, quantize_max_size=0),
+    "small": ExportProfile(compress_level=9, optimize=True, quantize_max_size=64),
+}
+
+def _strip(img):
+    """Copy of img with no metadata (info, ICC profile, DPI, text chunks)"""
+    return Image.frombytes(img.mode, img.size, img.tobytes())
+
+def _quantize(img, max_size):
+    """Palette version of img when that is lossless or the icon is small"""
+    if img.mode not in ("RGB", "L"):
+        return img
+    if img.getcolors(256) is not None:
+        return img.quantize(256, dither=Image.Dither.NONE)
+    if img.width <= max_size:
+        return img.quantize(256, dither=Image.Dither.FLOYDSTEINBERG)
+    return img
+
+def _save(img, profile):
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", compress_level=profile.compress_level, optimize=profile.optimize)
+    return buffer.getvalue()
+
+def encode_png(img, profile="default", quantize=False):
+    """Encode img as PNG bytes under a profile; identical pixels give identical bytes"""
+    profile = PROFILES[profile]
+    img = _strip(img)
+    data = _save(img, profile)
+    if quantize:
+        palette = _quantize(img, profile.quantize_max_size)
+        if palette is not img:
+            # A dithered palette can compress worse than the RGB original
+            data = min(data, _save(palette, profile), key=len)
+    return data
+
+def timed_encode(img, profile="default", quantize=False):
+    """encode_png() plus the time it took, as (data, seconds)"""
+    start = time.perf_counter()
+    with stage("png"):
+        data = encode_png(img, profile, quantize)
+    return data, time.perf_counter() - start
+
+def write_png(data, path):
+    """Write encoded PNG bytes to path, creating its directory"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def export_png(img, path, profile="default", quantize=False):
+    """Encode and write img to path, returning an ExportResult with size and timing"""
+    data, seconds = timed_encode(img, profile, quantize)
+    write_png(data, path)
+    return ExportResult(path, len(data), seconds)
+
+def format_result(result):
+    """One-line report for an export: file name, bytes and encode time"""
+    return f"  {os.path.basename(result.path)}: {result.bytes:,} bytes in {result.seconds * 1000:.1f} ms"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Font discovery and glyph-mask caching for the TenX logo scripts
+"""
+
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Bold sans fonts in order of preference. Absolute paths are tried as-is,
+# bare file names are searched for in FONT_DIRS.
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/System/Library/Fonts/SFNSDisplay.ttf",
+    "Helvetica-Bold.ttf",
+    "LiberationSans-Bold.ttf",
+    "DejaVuSans-Bold.ttf",
+    "NotoSans-Bold.ttf",
+    "FreeSansBold.ttf",
+    "Arial Bold.ttf",
+    "arialbd.ttf",
+]
+
+FONT_DIRS = [
+    "/Library/Fonts",
+    "/System/Library/Fonts/Supplemental",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+]
+
+@lru_cache(maxsize=None)
+def _font_index():
+    """Map font file name -> path for every font under FONT_DIRS (scanned once)"""
+    index = {}
+    stack = [d for d in FONT_DIRS if os.path.isdir(d)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith((".ttf", ".ttc", ".otf")):
+                    index.setdefault(entry.name, entry.path)
+    return index
+
+@lru_cache(maxsize=None)
+def find_font(candidates=tuple(FONT_CANDIDATES)):
+    """Path of the first available candidate font, or None for Pillow's default"""
+    for candidate in candidates:
+        if os.path.isabs(candidate):
+            if os.path.exists(candidate):
+                return candidate
+        elif candidate in _font_index():
+            return _font_index()[candidate]
+    return None
+
+@lru_cache(maxsize=128)
+def get_font(size, path=None):
+    """Memoized FreeType font for (size, path); Pillow's default when path is None"""
+    if path is None:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:  # Pillow < 10.1 has no sized default font
+            return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+@lru_cache(maxsize=256)
+def glyph_mask(text, size, path=None):
+    """Rasterize text once per (text, size, font) into a tight 'L' mask
+
+    Returns (mask, bbox) where bbox is the text's bounding box relative to
+    the draw origin, as ImageDraw.textbbox((0, 0), ...) would report it.
+    The returned mask is shared between callers and must not be modified.
+    """
+    font = get_font(size, path)
+    bbox = font.getbbox(text)
+    width, height = max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, font=font, fill=255)
+    return mask, bbox
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the TenX icon matrix
+
+Renders every icon size of each renderer and compares it with a stored
+golden PNG. Each image is first reduced to a small thumbnail of exact
+integer block sums; when golden and fresh thumbnails match, the pixels are
+taken as unchanged and the full-resolution diff is skipped. Otherwise the
+full diff reports max/mean channel error, the changed-pixel count and the
+Hamming distance between perceptual (difference) hashes, and a heatmap of
+the error is written next to the report.
+
+Text is drawn with whichever font find_font() picks on the machine
+(Helvetica on macOS, DejaVu or Liberation on Linux), so --update records
+the font and FreeType version in environment.json next to the goldens,
+and a check on a machine that differs says so before comparing.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image, features
+
+from logo_assets import slot_pixel_sizes
+from logo_batch import RENDERERS, output_name, resolve_renderer
+from logo_export import encode_png, write_png
+from logo_fonts import find_font
+from logo_pyramid import pyramid
+
+DEFAULT_GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo_golden")
+ENVIRONMENT_NAME = "environment.json"
+THUMBNAIL = 16
+
+Comparison = namedtuple("Comparison", "name max_error mean_error changed hash_distance")
+
+def thumbnail(pixels, cells=THUMBNAIL):
+    """(cells, cells, channels) exact uint32 block sums of a uint8 image array"""
+    height, width = pixels.shape[:2]
+    rows = np.linspace(0, height, min(cells, height) + 1).astype(int)[:-1]
+    cols = np.linspace(0, width, min(cells, width) + 1).astype(int)[:-1]
+    sums = np.add.reduceat(pixels, rows, axis=0, dtype=np.uint32)
+    return np.add.reduceat(sums, cols, axis=1)
+
+def perceptual_hash(pixels):
+    """64-bit difference hash: sign of horizontal luma steps on a 9x8 grid"""
+    luma = np.asarray(Image.fromarray(pixels).convert("L").resize((9, 8), Image.BILINEAR),
+                      dtype=np.int16)
+    bits = (luma[:, 1:] > luma[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+def heatmap(error):
+    """RGB image of a per-pixel error map: black, through red, to yellow at 255"""
+    scale = error.astype(np.float32) / max(int(error.max()), 1)
+    out = np.zeros(error.shape + (3,), dtype=np.uint8)
+    out[..., 0] = np.rint(np.minimum(scale * 2, 1) * 255)
+    out[..., 1] = np.rint(np.clip(scale * 2 - 1, 0, 1) * 255)
+    return Image.fromarray(out)
+
+def compare(name, golden, fresh):
+    """Comparison of two uint8 image arrays, plus the error map (None if identical)"""
+    if golden.shape != fresh.shape:
+        return Comparison(name, 255, 255.0, golden.shape[0] * golden.shape[1], 64), None
+    if np.array_equal(thumbnail(golden), thumbnail(fresh)):
+        return Comparison(name, 0, 0.0, 0, 0), None
+    diff = np.abs(golden.astype(np.int16) - fresh.astype(np.int16)).astype(np.uint8)
+    error = diff.max(axis=-1) if diff.ndim == 3 else diff
+    hash_distance = bin(perceptual_hash(golden) ^ perceptual_hash(fresh)).count("1")
+    result = Comparison(name, int(error.max()), float(diff.mean()),
+                        int(np.count_nonzero(error)), hash_distance)
+    return result, (error if result.max_error else None)
+
+def render_matrix(renderers, sizes):
+    """{file name: uint8 array} for every renderer x size (one master per renderer)"""
+    images = {}
+    for renderer in renderers:
+        # One master at the largest size, downscaled like create_logo does
+        master = resolve_renderer(renderer)(max(sizes))
+        for size, img in pyramid(master, sizes).items():
+            images[output_name(renderer, size)] = np.asarray(img.convert("RGB"))
+    return images
+
+def load_golden(directory, names):
+    """{file name: uint8 array} for the golden images that exist"""
+    golden = {}
+    for name in names:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with Image.open(path) as img:
+                golden[name] = np.asarray(img.convert("RGB"))
+    return golden
+
+def render_environment():
+    """What the text pixels depend on: the font file and the FreeType version"""
+    font = find_font()
+    return {"font": os.path.basename(font) if font else "Pillow default",
+            "freetype": features.version("freetype2")}
+
+def environment_changes(directory):
+    """Descriptions of how this machine differs from the one the goldens came from"""
+    try:
+        with open(os.path.join(directory, ENVIRONMENT_NAME)) as f:
+            recorded = json.load(f)
+    except (OSError, ValueError):
+        return []
+    current = render_environment()
+    return [f"{key} {recorded.get(key)} -> {value}" for key, value in current.items()
+            if recorded.get(key) != value]
+
+def check(golden, fresh, heatmap_dir=None):
+    """Compare every fresh image against its golden, writing heatmaps of failures"""
+    results = []
+    for name in sorted(fresh):
+        result, error = compare(name, golden[name], fresh[name])
+        results.append(result)
+        if heatmap_dir and error is not None:
+            os.makedirs(heatmap_dir, exist_ok=True)
+            heatmap(error).save(os.path.join(heatmap_dir, f"diff-{name}"))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TenX icon renders against golden images")
+    parser.add_argument("--renderer", action="append", choices=sorted(RENDERERS),
+                        help="renderer to check (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=slot_pixel_sizes())
+    parser.add_argument("--golden-dir", default=DEFAULT_GOLDEN_DIR)
+    parser.add_argument("--heatmap-dir", default=None,
+                        help="where to write diff heatmaps (default: <golden-dir>/diff)")
+    parser.add_argument("--max-error", type=int, default=0,
+                        help="largest per-channel error that still passes (default: 0)")
+    parser.add_argument("--update", action="store_true",
+                        help="replace the golden images with the fresh renders")
+    args = parser.parse_args()
+
+    fresh = render_matrix(args.renderer or sorted(RENDERERS), args.sizes)
+    if args.update:
+        for name, pixels in fresh.items():
+            write_png(encode_png(Image.fromarray(pixels)), os.path.join(args.golden_dir, name))
+        with open(os.path.join(args.golden_dir, ENVIRONMENT_NAME), "w") as f:
+            json.dump(render_environment(), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✅ Updated {len(fresh)} golden images in {args.golden_dir}")
+        return 0
+
+    for change in environment_changes(args.golden_dir):
+        print(f"⚠️  Goldens were rendered elsewhere ({change}); text pixels will differ")
+    golden = load_golden(args.golden_dir, fresh)
+    missing = sorted(set(fresh) - set(golden))
+    for name in missing:
+        print(f"❌ {name}: no golden image (run with --update)")
+        del fresh[name]
+
+    start = time.perf_counter()
+    results = check(golden, fresh, args.heatmap_dir or os.path.join(args.golden_dir, "diff"))
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if result.max_error > args.max_error]
+    for result in results:
+        if result.max_error:
+            flag = "❌" if result in failures else "⚠️ "
+            print(f"{flag} {result.name}: max {result.max_error}, mean {result.mean_error:.4f}, "
+                  f"{result.changed} px changed, phash distance {result.hash_distance}")
+    print(f"{'✅' if not failures and not missing else '❌'} Compared {len(results)} images "
+          f"in {elapsed * 1000:.0f} ms ({len(failures) + len(missing)} failing)")
+    return 1 if failures or missing else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Vectorized gradient helpers shared by the TenX logo scripts
+"""
+
+import numpy as np
+from PIL import Image
+
+def _ramp(count, offset=0, length=None):
+    """Interpolation factors (offset + i) / length, matching y / size"""
+    return (np.arange(count, dtype=np.float64) + offset) / (length or count)
+
+def _blend(start, end, t):
+    """Blend two RGB(A) colors along t and truncate like int() does"""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    values = start + (end - start) * t[..., None]
+    return np.floor(values).clip(0, 255).astype(np.uint8)
+
+def linear_gradient(width, height, start, end, horizontal=False, offset=0, length=None):
+    """Build a linear gradient as an (height, width, channels) uint8 array
+
+    The gradient runs top-to-bottom by default, or left-to-right when
+    horizontal is set. Colors are interpolated per row/column exactly like
+    the old per-row draw loop (start + (end - start) * i / length). To build
+    one tile of a larger gradient, pass the tile's offset along the
+    gradient and the full gradient length.
+
+    Only one line of colors is computed; the result is a read-only
+    broadcast view of it, so callers that need to write copy it first.
+    """
+    if horizontal:
+        colors = _blend(start, end, _ramp(width, offset, length))
+        return np.broadcast_to(colors[None, :, :], (height, width, colors.shape[-1]))
+    colors = _blend(start, end, _ramp(height, offset, length))
+    return np.broadcast_to(colors[:, None, :], (height, width, colors.shape[-1]))
+
+def radial_gradient(width, height, inner, outer, center=None, radius=None):
+    """Build a radial gradient as an (height, width, channels) uint8 array
+
+    inner is the color at center, outer the color at radius and beyond.
+    center defaults to the middle of the image and radius to the distance
+    from the center to the farthest corner.
+    """
+    if center is None:
+        center = (width / 2, height / 2)
+    cx, cy = center
+    if radius is None:
+        radius = max(np.hypot(cx, cy), np.hypot(width - cx, cy),
+                     np.hypot(cx, height - cy), np.hypot(width - cx, height - cy))
+    ys = np.arange(height, dtype=np.float64)[:, None] - cy
+    xs = np.arange(width, dtype=np.float64)[None, :] - cx
+    t = np.minimum(np.sqrt(xs * xs + ys * ys) / max(radius, 1e-9), 1.0)
+    return _blend(inner, outer, t)
+
+def gradient_image(array):
+    """Wrap a gradient array in a PIL image (RGB or RGBA by channel count)
+
+    A broadcast linear gradient is expanded from its one line of colors by
+    Pillow instead of being copied element by element.
+    """
+    height, width = array.shape[:2]
+    if array.strides[0] == 0:
+        return Image.fromarray(np.ascontiguousarray(array[:1])).resize((width, height), Image.NEAREST)
+    if array.strides[1] == 0:
+        return Image.fromarray(np.ascontiguousarray(array[:, :1])).resize((width, height), Image.NEAREST)
+    return Image.fromarray(np.ascontiguousarray(array))
+
+# Brand background used by both logo scripts: dark blue (#0A1929) to purple (#1A0A29)
+BACKGROUND_TOP = (10, 25, 41)
+BACKGROUND_BOTTOM = (26, 10, 41)
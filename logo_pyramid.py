@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Render-once icon pyramid: one master render, every size by downscaling
+"""
+
+from PIL import Image
+
+from instrumentation import stage
+
+def _halvings(master, smallest):
+    """Successive 2x box reductions of master down to just above smallest"""
+    levels = [master]
+    while levels[-1].width // 2 >= smallest:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+def downscale(levels, size):
+    """Resize from the smallest pyramid level that is still >= size
+
+    Every final resize is at most a 2x Lanczos step, which keeps small
+    icons sharp without the aliasing of rasterizing them directly.
+    """
+    source = levels[0]
+    for level in levels:
+        if level.width < size:
+            break
+        source = level
+    if source.width == size:
+        return source
+    return source.resize((size, size), Image.LANCZOS)
+
+def pyramid(master, sizes):
+    """{size: image} for every size, downscaled from an already rendered master"""
+    sizes = sorted(set(sizes), reverse=True)
+    with stage("downscale"):
+        levels = _halvings(master, sizes[-1])
+        return {size: downscale(levels, size) for size in sizes}
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Declarative layer renderer for the TenX logo scripts
+
+A logo is a scene: a tuple of layers painted bottom to top. Every layer is
+an immutable namedtuple with a vectorized NumPy backend that returns
+float32 patches of premultiplied RGBA in 0..1, stored as four planes
+(shape (4, height, width)) and each covering only the pixels the layer
+touches within the whole canvas or any region of it.
+Geometry is given in 1024-unit design space and scaled to the output size,
+so the same scene renders at any size. Layer patches are memoized per
+(layer, size), so layers shared between scenes are only computed once, and
+each patch is blended "over" the canvas only within its own bounds.
+"""
+
+import math
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from instrumentation import stage
+from logo_fonts import find_font, glyph_mask
+from logo_gradient import linear_gradient
+from logo_sdf import shape_bounds, shape_coverage
+
+DESIGN_SIZE = 1024
+
+def _rgba(color):
+    """Normalize an RGB or RGBA tuple to RGBA"""
+    return tuple(color) + (255,) * (4 - len(color))
+
+def premultiply(color):
+    """Premultiplied 0..1 float32 RGBA for an 8-bit RGB or RGBA color"""
+    r, g, b, a = _rgba(color)
+    alpha = a / 255.0
+    return np.array([r / 255.0 * alpha, g / 255.0 * alpha, b / 255.0 * alpha, alpha],
+                    dtype=np.float32)
+
+def _fill(coverage, color):
+    """Premultiplied buffer of a solid color through a 0..1 coverage mask"""
+    return premultiply(color)[:, None, None] * coverage
+
+def _opaque(rgb):
+    """Premultiplied buffer for an opaque uint8 (height, width, channels) RGB array"""
+    out = np.ones((4,) + rgb.shape[:2], dtype=np.float32)
+    np.multiply(rgb[..., :3].transpose(2, 0, 1), np.float32(1 / 255.0), out=out[:3])
+    return out
+
+def _canvas(size, box):
+    """Normalize box to an (x0, y0, x1, y1) region of a size x size canvas"""
+    return box or (0, 0, size, size)
+
+def _grid(box):
+    """Integer pixel coordinate grids (ys, xs) for a canvas region"""
+    x0, y0, x1, y1 = box
+    return (np.arange(y0, y1, dtype=np.float32)[:, None],
+            np.arange(x0, x1, dtype=np.float32)[None, :])
+
+def _intersect(a, b):
+    """Intersection of two (x0, y0, x1, y1) boxes, or None when empty"""
+    box = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+def _crop(array, box, origin):
+    """The part of a mask or buffer covering canvas box
+
+    The array's last two axes are rows and columns, with its top-left pixel
+    at canvas position origin (x, y, ...).
+    """
+    x, y = origin[:2]
+    return array[..., box[1] - y:box[3] - y, box[0] - x:box[2] - x]
+
+def paint(out, box, patches):
+    """Blend (region, buffer) patches "over" out, the buffer of canvas box
+
+    Only the pixels of each patch's region are touched.
+    """
+    for region, buffer in patches:
+        target = _crop(out, region, box)
+        target *= 1.0 - buffer[3]
+        target += buffer
+
+# Every layer implements patches(size, box): (region, buffer) pairs where
+# region is an (x0, y0, x1, y1) part of box, itself a region of a size x
+# size canvas, and buffer the premultiplied pixels of that region. Patches
+# are painted in order and only cover what the layer draws, so a layer
+# costs what its pixels cost. raster(size, box=None) paints them into a
+# buffer of the whole box (or canvas). Rendering a region never needs the
+# full canvas, which is what lets logo_tiled render very large outputs tile
+# by tile.
+#
+# Layers also implement bases(size, box=None), splitting their raster into
+# per-color weight maps: the premultiplied RGB is sum(weight * rgb / 255)
+# over (rgb, weight) pairs, and alpha is the layer's coverage. Geometry
+# lives in the weights and color in the rgb keys, which is what lets
+# logo_variants recolor a scene without rasterizing it again. Every color
+# also has a role naming the part of the scene it paints: the layer's
+# stage name plus, for layers with several colors, which one ("text",
+# "gradient.start", "glow.0" for the outermost ring, "shape.2"), so a
+# palette can recolor one part without touching another of the same color.
+Bases = namedtuple("Bases", "alpha colors weights roles")
+
+class _Layer:
+    __slots__ = ()
+
+    def raster(self, size, box=None):
+        """Premultiplied buffer of a canvas region (the whole canvas by default)"""
+        x0, y0, x1, y1 = box = _canvas(size, box)
+        out = np.zeros((4, y1 - y0, x1 - x0), dtype=np.float32)
+        paint(out, box, self.patches(size, box))
+        return out
+
+def _solid_bases(coverage, color, role):
+    """Bases of a solid color through a 0..1 coverage mask"""
+    r, g, b, a = _rgba(color)
+    weight = coverage * np.float32(a / 255.0)
+    return Bases(weight, [(r, g, b)], [weight], [role])
+
+def _gradient_bases(t, shape, start, end, role):
+    """Bases of a two-color gradient with interpolation factors t (0..1)
+
+    The colors get the roles "<role>.start" and "<role>.end".
+    """
+    start, end = _rgba(start), _rgba(end)
+    t = np.broadcast_to(np.asarray(t, dtype=np.float32), shape)
+    w_start = (1.0 - t) * np.float32(start[3] / 255.0)
+    w_end = t * np.float32(end[3] / 255.0)
+    return Bases(w_start + w_end, [start[:3], end[:3]], [w_start, w_end],
+                 [f"{role}.start", f"{role}.end"])
+
+class GradientLayer(_Layer, namedtuple("GradientLayer", "start end horizontal", defaults=(False,))):
+    """Full-canvas linear gradient"""
+    __slots__ = ()
+
+    def patches(self, size, box):
+        x0, y0, x1, y1 = box
+        gradient = linear_gradient(x1 - x0, y1 - y0, _rgba(self.start), _rgba(self.end),
+                                   self.horizontal, offset=x0 if self.horizontal else y0,
+                                   length=size)
+        # Premultiply the one line of colors, then broadcast it (read-only)
+        line = gradient[:1] if self.horizontal else gradient[:, :1]
+        line = line.transpose(2, 0, 1).astype(np.float32) * np.float32(1 / 255.0)
+        line[:3] *= line[3]
+        yield box, np.broadcast_to(line, (4, y1 - y0, x1 - x0))
+
+    def bases(self, size, box=None):
+        x0, y0, x1, y1 = _canvas(size, box)
+        if self.horizontal:
+            t = (np.arange(x0, x1, dtype=np.float32) / size)[None, :]
+        else:
+            t = (np.arange(y0, y1, dtype=np.float32) / size)[:, None]
+        return _gradient_bases(t, (y1 - y0, x1 - x0), self.start, self.end, stage_name(self))
+
+class GridLayer(_Layer, namedtuple("GridLayer", "color divisions", defaults=(10,))):
+    """One-pixel grid lines every size // divisions pixels"""
+    __slots__ = ()
+
+    def patches(self, size, box):
+        spacing = size // self.divisions
+        if not spacing:
+            return
+        x0, y0, x1, y1 = box
+        color = premultiply(self.color)[:, None, None]
+        rows = [y for y in range(0, size, spacing) if y0 <= y < y1]
+        for y in rows:
+            yield (x0, y, x1, y + 1), np.broadcast_to(color, (4, 1, x1 - x0))
+        # Columns are transparent where they cross a row, so no pixel is painted twice
+        column = np.empty((4, y1 - y0, 1), dtype=np.float32)
+        column[:] = color
+        column[:, [y - y0 for y in rows]] = 0.0
+        column.setflags(write=False)
+        for x in range(0, size, spacing):
+            if x0 <= x < x1:
+                yield (x, y0, x + 1, y1), column
+
+    def coverage(self, size, box=None):
+        ys, xs = _grid(_canvas(size, box))
+        spacing = size // self.divisions
+        if not spacing:
+            return np.zeros((len(ys), xs.shape[1]), dtype=np.float32)
+        return ((xs % spacing == 0) | (ys % spacing == 0)).astype(np.float32)
+
+    def bases(self, size, box=None):
+        return _solid_bases(self.coverage(size, box), self.color, stage_name(self))
+
+class ShapeLayer(_Layer, namedtuple("ShapeLayer", "shapes")):
+    """Anti-aliased solid shapes painted in order
+
+    shapes is a tuple of (shape, color) where shape is a logo_sdf shape in
+    design units. Each shape is evaluated as a signed distance field only
+    within its bounds, and regions subtracted from a shape stay transparent.
+    """
+    __slots__ = ()
+
+    def _coverages(self, size, box):
+        """(index, region, coverage, color) of every shape that reaches into box"""
+        scale = size / DESIGN_SIZE
+        for index, (shape, color) in enumerate(self.shapes):
+            reach = shape_bounds(shape, scale)
+            hit = reach and _intersect(box, (int(reach[0]) - 1, int(reach[1]) - 1,
+                                             int(math.ceil(reach[2])) + 1, int(math.ceil(reach[3])) + 1))
+            if hit:
+                ys, xs = _grid(hit)
+                yield index, hit, shape_coverage(shape, xs + 0.5, ys + 0.5, scale), color
+
+    def patches(self, size, box):
+        for _, region, coverage, color in self._coverages(size, box):
+            yield region, _fill(coverage, color)
+
+    def bases(self, size, box=None):
+        x0, y0, x1, y1 = box = _canvas(size, box)
+        shapes = [Bases(np.zeros((y1 - y0, x1 - x0), dtype=np.float32), [], [], [])]
+        for index, region, coverage, color in self._coverages(size, box):
+            full = np.zeros((y1 - y0, x1 - x0), dtype=np.float32)
+            _crop(full, region, box)[...] = coverage
+            shapes.append(_solid_bases(full, color, f"{stage_name(self)}.{index}"))
+        return merge_bases(shapes)
+
+class TextLayer(_Layer, namedtuple("TextLayer", "text color scale fallback_scale y_shift",
+                           defaults=(0.35, 0.2, 0.0))):
+    """Centered text; scale is the font size as a fraction of the canvas
+
+    fallback_scale is used instead when no system font is found and the
+    text is drawn with Pillow's default font. y_shift moves the text up or
+    down as a fraction of the canvas.
+    """
+    __slots__ = ()
+
+    def patches(self, size, box):
+        layout = text_layout(self, size)
+        hit = _intersect(box, layout.rect)
+        if hit:
+            yield hit, _fill(_crop(layout.glyphs, hit, layout.origin) * np.float32(1 / 255.0), self.color)
+
+    def bases(self, size, box=None):
+        coverage = text_layout(self, size).window(_canvas(size, box))
+        return _solid_bases(coverage * np.float32(1 / 255.0), self.color, stage_name(self))
+
+class TextLayout(namedtuple("TextLayout", "x y width height font_size font_path glyphs origin")):
+    """Placement of a TextLayer on the canvas
+
+    glyphs is the tight uint8 coverage mask from the glyph cache and origin
+    the canvas position of its top-left pixel, so no full-canvas mask is
+    ever allocated.
+    """
+    __slots__ = ()
+
+    @property
+    def rect(self):
+        gx, gy = self.origin
+        return (gx, gy, gx + self.glyphs.shape[1], gy + self.glyphs.shape[0])
+
+    def window(self, box):
+        """uint8 text coverage of a canvas region (zero outside the glyphs)"""
+        x0, y0, x1, y1 = box
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        hit = _intersect(box, self.rect)
+        if hit:
+            gx, gy = self.origin
+            out[hit[1] - y0:hit[3] - y0, hit[0] - x0:hit[2] - x0] = \
+                self.glyphs[hit[1] - gy:hit[3] - gy, hit[0] - gx:hit[2] - gx]
+        return out
+
+@lru_cache(maxsize=32)
+def text_layout(layer, size):
+    """Font, position and glyph mask of a TextLayer at size (memoized)"""
+    with stage("text_layout"):
+        return _text_layout(layer, size)
+
+def _text_layout(layer, size):
+    font_path = find_font()
+    font_size = int(size * (layer.scale if font_path else layer.fallback_scale))
+    mask, bbox = glyph_mask(layer.text, font_size, font_path)
+    width = bbox[2] - bbox[0]
+    height = bbox[3] - bbox[1]
+    x = (size - width) // 2
+    y = (size - height) // 2 + int(size * layer.y_shift)
+    glyphs = np.asarray(mask, dtype=np.uint8)
+    return TextLayout(x, y, width, height, font_size, font_path, glyphs, (x + bbox[0], y + bbox[1]))
+
+def _halo_patch(layout, box, radius, strength):
+    """(region, blurred and boosted 0..1 text coverage) within box, or None
+
+    Only the part of box within reach of the glyphs is blurred, from a
+    source window padded by the blur's reach, so a tile gives exactly the
+    pixels a full-canvas render would.
+    """
+    reach = int(math.ceil(3 * radius)) + 1
+    gx0, gy0, gx1, gy1 = layout.rect
+    hit = _intersect(box, (gx0 - reach, gy0 - reach, gx1 + reach, gy1 + reach))
+    if not hit:
+        return None
+    hx0, hy0, hx1, hy1 = hit
+    source = layout.window((hx0 - reach, hy0 - reach, hx1 + reach, hy1 + reach))
+    halo = np.asarray(Image.fromarray(source).filter(ImageFilter.GaussianBlur(radius)),
+                      dtype=np.float32)[reach:reach + hy1 - hy0, reach:reach + hx1 - hx0]
+    return hit, np.minimum(halo * np.float32(strength / 255.0), 1.0)
+
+def _halo(layout, box, radius, strength):
+    """Blurred, boosted text coverage of a whole canvas region (0..1)"""
+    x0, y0, x1, y1 = box
+    out = np.zeros((y1 - y0, x1 - x0), dtype=np.float32)
+    patch = _halo_patch(layout, box, radius, strength)
+    if patch:
+        _crop(out, patch[0], box)[...] = patch[1]
+    return out
+
+class GlowLayer(_Layer, namedtuple("GlowLayer", "text rings strength", defaults=(2.0,))):
+    """Soft halo around a TextLayer built from its cached glyph mask
+
+    rings is a tuple of (rgba_color, radius_px) pairs, outermost first. Each
+    ring is the glyph mask blurred by radius and boosted by strength, so the
+    cost does not depend on the radius.
+    """
+    __slots__ = ()
+
+    def patches(self, size, box):
+        layout = text_layout(self.text, size)
+        for color, radius in self.rings:
+            patch = _halo_patch(layout, box, radius, self.strength)
+            if patch:
+                yield patch[0], _fill(patch[1], color)
+
+    def bases(self, size, box=None):
+        layout = text_layout(self.text, size)
+        box = _canvas(size, box)
+        rings = [_solid_bases(_halo(layout, box, radius, self.strength), color, f"{stage_name(self)}.{index}")
+                 for index, (color, radius) in enumerate(self.rings)]
+        return merge_bases(rings)
+
+class UnderlineLayer(_Layer, namedtuple("UnderlineLayer", "text start end width gap thickness",
+                                defaults=(0.8, 0.05, 0.015))):
+    """Horizontal gradient bar centered under a TextLayer
+
+    width is a fraction of the text width; gap and thickness are fractions
+    of the canvas.
+    """
+    __slots__ = ()
+
+    def patches(self, size, box):
+        layout = text_layout(self.text, size)
+        line_width = int(layout.width * self.width)
+        if line_width <= 0:
+            return
+        line_x = layout.x + (layout.width - line_width) // 2
+        line_y = layout.y + layout.height + int(size * self.gap)
+        bar = (line_x, line_y, line_x + line_width, line_y + int(size * self.thickness) + 1)
+        hit = _intersect(box, bar)
+        if hit:
+            gradient = linear_gradient(hit[2] - hit[0], hit[3] - hit[1], _rgba(self.start), _rgba(self.end),
+                                       horizontal=True, offset=hit[0] - line_x, length=line_width)
+            yield hit, _opaque(gradient)
+
+    def bases(self, size, box=None):
+        x0, y0, x1, y1 = box = _canvas(size, box)
+        layout = text_layout(self.text, size)
+        t = np.zeros((y1 - y0, x1 - x0), dtype=np.float32)
+        inside = np.zeros_like(t)
+        line_width = int(layout.width * self.width)
+        line_x = layout.x + (layout.width - line_width) // 2
+        line_y = layout.y + layout.height + int(size * self.gap)
+        bar = (line_x, line_y, line_x + line_width, line_y + int(size * self.thickness) + 1)
+        hit = _intersect(box, bar) if line_width > 0 else None
+        if hit:
+            region = (slice(hit[1] - y0, hit[3] - y0), slice(hit[0] - x0, hit[2] - x0))
+            t[region] = (np.arange(hit[0], hit[2], dtype=np.float32) - line_x) / line_width
+            inside[region] = 1.0
+        bases = _gradient_bases(t, t.shape, self.start, self.end, stage_name(self))
+        return Bases(bases.alpha * inside, bases.colors, [w * inside for w in bases.weights], bases.roles)
+
+def stage_name(layer):
+    """Instrumentation stage name of a layer: GlowLayer -> "glow" """
+    return type(layer).__name__.replace("Layer", "").lower()
+
+# Memoized layer patches, least recently used first, within a byte budget.
+# Patches only cover what a layer draws, so most layers cost far less than
+# a full-canvas buffer (size * size * 16 bytes, 16 MB at 1024 px).
+PATCH_CACHE_BYTES = 128 * 1024 * 1024
+_patches = OrderedDict()
+
+def _footprint(patches):
+    """Bytes held by patches; broadcast dimensions are stored once"""
+    return sum(buffer.itemsize * math.prod(n for n, stride in zip(buffer.shape, buffer.strides) if stride)
+               for _, buffer in patches)
+
+def clear_caches():
+    """Drop memoized layer patches and text layouts (for cold-render timing)"""
+    _patches.clear()
+    text_layout.cache_clear()
+    glyph_mask.cache_clear()
+
+def layer_patches(layer, size):
+    """Patches of a layer over the whole canvas, computed once per (layer, size)
+
+    The buffers are shared with later callers and read-only.
+    """
+    key = (type(layer), layer, size)
+    patches = _patches.get(key)
+    if patches is not None:
+        _patches.move_to_end(key)
+        return patches
+    with stage(stage_name(layer)):
+        patches = tuple(layer.patches(size, (0, 0, size, size)))
+    for _, buffer in patches:
+        buffer.setflags(write=False)
+    footprint = _footprint(patches)
+    if footprint <= PATCH_CACHE_BYTES:
+        _patches[key] = patches
+        cached = sum(_footprint(value) for value in _patches.values())
+        while cached > PATCH_CACHE_BYTES:
+            cached -= _footprint(_patches.popitem(last=False)[1])
+    return patches
+
+def scene_buffer(scene, size, box=None):
+    """Premultiplied buffer of a canvas region of a scene, without caching"""
+    x0, y0, x1, y1 = box = _canvas(size, box)
+    out = np.zeros((4, y1 - y0, x1 - x0), dtype=np.float32)
+    for layer in scene:
+        paint(out, box, layer.patches(size, box))
+    return out
+
+def merge_bases(layers):
+    """Composite a stack of Bases (bottom first) into one Bases
+
+    Each layer's weights are attenuated by the transmittance (product of
+    1 - alpha) of the layers above it, which is "over" compositing in closed
+    form, and weights of the same color in the same role are summed.
+    """
+    transmittance = np.ones_like(layers[0].alpha)
+    merged = {}
+    for layer in reversed(layers):
+        for role, color, weight in zip(layer.roles, layer.colors, layer.weights):
+            weighted = weight * transmittance
+            if (role, color) in merged:
+                merged[role, color] += weighted
+            else:
+                merged[role, color] = weighted
+        transmittance = transmittance * (1.0 - layer.alpha)
+    alpha = 1.0 - transmittance
+    keys = sorted(merged)
+    return Bases(alpha, [color for _, color in keys], [merged[key] for key in keys],
+                 [role for role, _ in keys])
+
+def flatten(buffer, mode="RGB"):
+    """Convert a premultiplied buffer to a uint8 RGB (over black) or RGBA image"""
+    if mode == "RGB":
+        planes = buffer[:3] * np.float32(255.0)
+    else:
+        alpha = buffer[3]
+        planes = np.zeros_like(buffer)
+        np.divide(buffer[:3], alpha, out=planes[:3], where=alpha > 0)
+        planes[3] = alpha
+        planes *= np.float32(255.0)
+    np.clip(planes, 0, 255, out=planes)
+    planes = np.rint(planes, out=planes).astype(np.uint8)
+    return Image.merge(mode, [Image.fromarray(plane) for plane in planes])
+
+def render_scene(scene, size, mode="RGB"):
+    """Render a scene (tuple of layers, bottom first) to an RGB or RGBA image"""
+    box = (0, 0, size, size)
+    out = np.zeros((4, size, size), dtype=np.float32)
+    for index, layer in enumerate(scene):
+        patches = layer_patches(layer, size)
+        with stage("composite"):
+            if index == 0 and len(patches) == 1 and patches[0][0] == box:
+                out[...] = patches[0][1]  # "over" an empty canvas is a copy
+            else:
+                paint(out, box, patches)
+    with stage("flatten"):
+        return flatten(out, mode)
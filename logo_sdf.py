@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Signed distance fields for the geometric TenX logo shapes
+
+A shape is a nested tuple in 1024-unit design space:
+
+    ("rect", (x0, y0, x1, y1))
+    ("ellipse", (x0, y0, x1, y1))
+    ("ring", (x0, y0, x1, y1), width)          elliptical ring, box is the outside
+    ("arch", (x0, y0, x1, y1), width)          "n"-shaped arch: half ring on two legs
+    ("diagonal", (x0, y0, x1, y1), width)      slanted bar from (x0, y0) to (x1, y1)
+                                               with flat top and bottom; width is
+                                               measured horizontally
+    ("union", shape, shape, ...)
+    ("subtract", shape, shape, ...)            first shape minus the others
+    ("intersect", shape, shape, ...)
+
+shape_distance() evaluates a shape over a pixel grid in one vectorized
+pass; negative values are inside, in output pixels. shape_coverage()
+turns distances into an anti-aliased 0..1 mask, so no supersampling is
+needed and subtracted regions are genuinely transparent. It evaluates
+every primitive in float32 and only within that primitive's own bounds,
+combining coverages rather than distances, which gives the same mask
+because the one-pixel ramp is monotonic.
+"""
+
+import math
+
+import numpy as np
+
+def _scaled(box, scale):
+    return tuple(v * scale for v in box)
+
+def _rect(xs, ys, scale, box):
+    x0, y0, x1, y1 = _scaled(box, scale)
+    qx = np.abs(xs - (x0 + x1) / 2) - (x1 - x0) / 2
+    qy = np.abs(ys - (y0 + y1) / 2) - (y1 - y0) / 2
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    return outside + np.minimum(np.maximum(qx, qy), 0)
+
+def _ellipse_distance(xs, ys, cx, cy, rx, ry):
+    # Closed-form approximation, exact on the boundary and for circles
+    px, py = (xs - cx) / rx, (ys - cy) / ry
+    k0 = np.hypot(px, py)
+    k1 = np.maximum(np.hypot(px / rx, py / ry), 1e-6)
+    return k0 * (k0 - 1.0) / k1
+
+def _ellipse(xs, ys, scale, box):
+    x0, y0, x1, y1 = _scaled(box, scale)
+    return _ellipse_distance(xs, ys, (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2)
+
+def _ring(xs, ys, scale, box, width):
+    x0, y0, x1, y1 = _scaled(box, scale)
+    half = width * scale / 2
+    middle = _ellipse_distance(xs, ys, (x0 + x1) / 2, (y0 + y1) / 2,
+                               (x1 - x0) / 2 - half, (y1 - y0) / 2 - half)
+    return np.abs(middle) - half
+
+def _arch(xs, ys, scale, box, width):
+    x0, y0, x1, y1 = _scaled(box, scale)
+    half = width * scale / 2
+    radius = (x1 - x0) / 2
+    cx, cy = x0 + radius, y0 + radius
+    # Semicircular ring above the center line, two vertical legs below it
+    ring = np.abs(np.hypot(xs - cx, ys - cy) - (radius - half)) - half
+    legs = np.abs(np.abs(xs - cx) - (radius - half)) - half
+    return np.maximum(np.where(ys < cy, ring, legs), ys - y1)
+
+def _diagonal(xs, ys, scale, line, width):
+    x0, y0, x1, y1 = _scaled(line, scale)
+    if y0 > y1:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    slope = (x1 - x0) / (y1 - y0)
+    # Horizontal offset from the center line, converted to a perpendicular distance
+    across = (np.abs(xs - (x0 + (ys - y0) * slope)) - width * scale / 2) / math.hypot(1.0, slope)
+    return np.maximum(across, np.maximum(y0 - ys, ys - y1))
+
+def _union(fields):
+    return np.minimum.reduce(fields)
+
+def _subtract(fields):
+    return np.maximum.reduce([fields[0]] + [-field for field in fields[1:]])
+
+def _intersect(fields):
+    return np.maximum.reduce(fields)
+
+_PRIMITIVES = {
+    "rect": _rect,
+    "ellipse": _ellipse,
+    "ring": _ring,
+    "arch": _arch,
+    "diagonal": _diagonal,
+}
+_OPERATIONS = {"union": _union, "subtract": _subtract, "intersect": _intersect}
+
+def shape_distance(shape, xs, ys, scale=1.0):
+    """Signed distance in pixels from pixel centers (xs, ys) to shape"""
+    kind, *args = shape
+    if kind in _OPERATIONS:
+        return _OPERATIONS[kind]([shape_distance(child, xs, ys, scale) for child in args])
+    return _PRIMITIVES[kind](xs, ys, scale, *args)
+
+def _coverage(shape, xs, ys, scale, inside):
+    """Coverage of shape (or of its complement when not inside) over a grid"""
+    kind, *args = shape
+    if kind in _OPERATIONS:
+        if kind == "subtract":
+            children = [(args[0], inside)] + [(child, not inside) for child in args[1:]]
+        else:
+            children = [(child, inside) for child in args]
+        # Union is the largest coverage and intersection the smallest; the
+        # complement swaps the two (and subtract is an intersection)
+        largest = (kind == "union") == inside
+        combine = np.maximum if largest else np.minimum
+        out = None
+        for child, child_inside in children:
+            coverage = _coverage(child, xs, ys, scale, child_inside)
+            out = coverage if out is None else combine(out, coverage, out=out)
+        return out
+
+    out = np.full((ys.size, xs.size), 0.0 if inside else 1.0, dtype=np.float32)
+    x0, y0, x1, y1 = shape_bounds(shape, scale)
+    # Pixels more than a pixel outside the bounds are off the ramp
+    i0, i1 = np.searchsorted(xs.ravel(), (x0 - 1, x1 + 1))
+    j0, j1 = np.searchsorted(ys.ravel(), (y0 - 1, y1 + 1))
+    if i0 < i1 and j0 < j1:
+        distance = _PRIMITIVES[kind](xs[:, i0:i1], ys[j0:j1], scale, *args)
+        ramp = 0.5 - distance if inside else 0.5 + distance
+        np.clip(ramp, 0.0, 1.0, out=out[j0:j1, i0:i1])
+    return out
+
+def shape_coverage(shape, xs, ys, scale=1.0):
+    """Anti-aliased 0..1 coverage of shape: a one-pixel ramp across the edge
+
+    xs is a (1, width) row and ys a (height, 1) column of increasing float32
+    pixel centers; each primitive is only evaluated within its bounds.
+    """
+    return _coverage(shape, xs, ys, scale, True)
+
+def shape_bounds(shape, scale=1.0):
+    """Canvas (x0, y0, x1, y1) bounds of shape, or None when it is empty"""
+    kind, *args = shape
+    if kind == "union":
+        boxes = [box for box in (shape_bounds(child, scale) for child in args) if box]
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+    if kind == "subtract":
+        return shape_bounds(args[0], scale)
+    if kind == "intersect":
+        boxes = [shape_bounds(child, scale) for child in args]
+        if not all(boxes):
+            return None
+        return (max(b[0] for b in boxes), max(b[1] for b in boxes),
+                min(b[2] for b in boxes), min(b[3] for b in boxes))
+    x0, y0, x1, y1 = _scaled(args[0], scale)
+    if kind == "diagonal":
+        pad = args[1] * scale / 2
+        x0, x1 = min(x0, x1) - pad, max(x0, x1) + pad
+        y0, y1 = min(y0, y1), max(y0, y1)
+    return (x0, y0, x1, y1)
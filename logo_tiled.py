@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tiled, bounded-memory rendering of TenX logo scenes for very large outputs
+
+The scene is evaluated one tile at a time (every layer can rasterize an
+arbitrary canvas region, see logo_scene) and finished rows are streamed
+straight into a zlib-compressed PNG. Working memory is a few float tiles
+plus one uint8 band of tile rows, independent of the output size apart
+from the glyph mask of the text.
+"""
+
+import argparse
+import importlib
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from logo_scene import scene_buffer
+
+SCENES = {
+    "logo": "create_logo:SCENE",
+    "simple": "create_simple_logo:SCENE",
+}
+
+def resolve_scene(name):
+    """Scene tuple for a short name or "module:ATTRIBUTE" path"""
+    module_name, _, attribute = SCENES.get(name, name).partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "SCENE")
+
+def render_tile(scene, size, box):
+    """uint8 RGB pixels of one canvas region"""
+    buffer = scene_buffer(scene, size, box)
+    return np.rint(np.clip(buffer[:3] * 255.0, 0, 255)).astype(np.uint8).transpose(1, 2, 0)
+
+def render_bands(scene, size, tile=512):
+    """Yield (y, rows) bands of up to tile rows of the final RGB image"""
+    for y0 in range(0, size, tile):
+        y1 = min(y0 + tile, size)
+        band = np.empty((y1 - y0, size, 3), dtype=np.uint8)
+        for x0 in range(0, size, tile):
+            x1 = min(x0 + tile, size)
+            band[:, x0:x1] = render_tile(scene, size, (x0, y0, x1, y1))
+        yield y0, band
+
+def _chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+def write_png_stream(path, width, height, bands, level=6):
+    """Write RGB bands to an 8-bit PNG without holding the whole image
+
+    Rows use the PNG "Up" filter, computed for a whole band at once against
+    the last row of the previous band, which suits the vertical gradients.
+    """
+    compressor = zlib.compressobj(level)
+    previous = np.zeros((1, width * 3), dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        for _, band in bands:
+            rows = band.reshape(band.shape[0], width * 3)
+            filtered = np.empty((rows.shape[0], width * 3 + 1), dtype=np.uint8)
+            filtered[:, 0] = 2  # filter type "Up"
+            np.subtract(rows, np.concatenate([previous, rows[:-1]]), out=filtered[:, 1:])
+            previous = rows[-1:]
+            data = compressor.compress(filtered.tobytes())
+            if data:
+                f.write(_chunk(b"IDAT", data))
+        f.write(_chunk(b"IDAT", compressor.flush()))
+        f.write(_chunk(b"IEND", b""))
+
+def render_tiled(scene, size, path, tile=512, level=6):
+    """Render scene at size straight to a PNG file, tile by tile"""
+    write_png_stream(path, size, size, render_bands(scene, size, tile), level)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a very large TenX logo with bounded memory")
+    parser.add_argument("--scene", default="logo", help="logo, simple or module:ATTRIBUTE")
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--tile", type=int, default=512)
+    parser.add_argument("--level", type=int, default=6, help="zlib compression level")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    output = args.output or f"TenX-{args.scene}-{args.size}.png"
+    start = time.perf_counter()
+    render_tiled(resolve_scene(args.scene), args.size, output, args.tile, args.level)
+    print(f"✅ Rendered {args.size}x{args.size} to {output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
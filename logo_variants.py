@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Batched multi-variant rendering of TenX logo scenes
+
+A variant is the same scene with a different palette: dark and tinted
+appearances, a light alternate icon, seasonal editions. Instead of
+rendering the scene once per variant, the scene is decomposed once into
+per-color weight maps (see Bases in logo_scene) and every variant is a
+matrix product of its palette with those maps, so N variants cost one
+rasterization plus one (N*3, K) x (K, pixels) multiply.
+
+A palette is either a dict mapping color roles (the parts of the scene
+named in Bases, such as "text" or "glow.0") to replacement RGB colors,
+with unlisted roles keeping their design color, or a callable taking and
+returning an (r, g, b) tuple, which recolors every role alike.
+"""
+
+import numpy as np
+from PIL import Image
+
+from instrumentation import stage
+from logo_scene import merge_bases
+
+def scene_bases(scene, size, box=None):
+    """Composited Bases of a whole scene (bottom layer first)"""
+    with stage("bases"):
+        return merge_bases([layer.bases(size, box) for layer in scene])
+
+def grayscale(rgb):
+    """Rec. 601 luma of an RGB color, as a gray RGB color"""
+    r, g, b = rgb
+    luma = int(round(0.299 * r + 0.587 * g + 0.114 * b))
+    return (luma, luma, luma)
+
+def apply_palette(palette, role, rgb):
+    """Replacement color of the role painted rgb under a palette (None keeps every color)"""
+    if palette is None:
+        return tuple(rgb)
+    if callable(palette):
+        return tuple(palette(tuple(rgb)))
+    return tuple(palette.get(role, rgb))
+
+def render_variants(scene, size, palettes, mode="RGB"):
+    """Render a scene once per palette, returning {name: Image}
+
+    palettes maps variant names to palettes. All variants share one
+    decomposition of the scene and are colored in a single matmul.
+    """
+    bases = scene_bases(scene, size)
+    names = list(palettes)
+    height, width = bases.alpha.shape
+    with stage("variants"):
+        colors = np.array([
+            [apply_palette(palettes[name], role, rgb) for role, rgb in zip(bases.roles, bases.colors)]
+            for name in names
+        ], dtype=np.float32).reshape(len(names), len(bases.colors), 3) * np.float32(1 / 255.0)
+        weights = np.stack([np.broadcast_to(w, (height, width)) for w in bases.weights])
+        weights = weights.reshape(len(bases.colors), -1)
+        # (N, 3, K) @ (K, pixels) -> (N, 3, pixels)
+        rgb = np.matmul(colors.transpose(0, 2, 1), weights)
+        rgb = rgb.reshape(len(names), 3, height, width).transpose(0, 2, 3, 1)
+    with stage("flatten"):
+        images = {}
+        for index, name in enumerate(names):
+            channels = rgb[index]
+            if mode == "RGBA":
+                alpha = bases.alpha[..., None]
+                channels = np.divide(channels, alpha, out=np.zeros_like(channels), where=alpha > 0)
+                channels = np.concatenate([channels, np.broadcast_to(alpha, (height, width, 1))], axis=-1)
+            images[name] = Image.fromarray(np.rint(np.clip(channels * 255.0, 0, 255)).astype(np.uint8))
+        return images
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Streaming parser and object model for Xcode project.pbxproj files
+
+project.pbxproj is an OpenStep-style property list: dictionaries
+`{ key = value; }`, arrays `( value, )` and strings, bare or quoted, with
+`/* ... */` comments after object IDs. The tokenizer runs one compiled
+regex over a memory-mapped file and the parser builds plain dicts, lists
+and Token strings in a single pass, so parsing is linear in the file size.
+
+Project indexes the objects by ID and by isa and keeps back-references
+(which objects point at an ID, under which key), e.g. from a file
+reference to its build files and groups. serialize() writes the model back
+in Xcode's layout; everything the layout does not determine (string
+spelling, comments, single-line objects, section placement, key and
+object order) is kept from the source, so an unmodified project in that
+layout round-trips byte for byte. Stray whitespace in hand-edited files is
+normalized to the layout Xcode itself would write.
+"""
+
+import mmap
+import re
+
+HEADER = "// !$*UTF8*$!"
+
+# One match per token, including the whitespace before it. "bare" only takes
+# strings Xcode would write unquoted; anything else unquoted is "odd".
+_TOKEN = re.compile(rb"""\s*(?:
+    (?P<bare>(?:[A-Za-z0-9_$:.]|/(?![/*]))+)(?![^\s{}()=;,"/])
+  | (?P<punct>[{}()=;,])
+  | (?P<quoted>"(?:[^"\\]|\\.)*")
+  | (?P<comment>/\*.*?\*/)
+  | (?P<odd>(?:[^\s{}()=;,"/]|/(?![/*]))+)
+  | (?P<line>//[^\n]*)
+  | (?P<error>\S)
+)""", re.S | re.X)
+
+_SECTION = re.compile(r"^(Begin|End) (\w+) section$")
+_BARE = re.compile(r"^[A-Za-z0-9_$/:.]+$")
+_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\t": "\\t"}
+_UNESCAPES = {value: key for key, value in _ESCAPES.items()}
+_ESCAPED = re.compile(r'[\\"\n\t]')
+_UNESCAPED = re.compile(r'\\[\\"nt]')
+
+class PBXParseError(ValueError):
+    """Malformed project file; the message names the byte offset"""
+
+class Token(str):
+    """A string from a project file
+
+    comment holds the `/* ... */` annotation that followed it on the same
+    line, raw the source spelling when it differs from quote(value).
+    """
+    comment = None
+    raw = None
+
+class InlineDict(dict):
+    """Dictionary that was written on a single line"""
+
+class InlineList(list):
+    """Array that was written on a single line"""
+
+def quote(value):
+    """Spelling of a string the way Xcode writes it (quoted only when needed)"""
+    if _BARE.match(value) and "//" not in value:
+        return value
+    return '"' + _ESCAPED.sub(lambda m: _ESCAPES[m.group()], value) + '"'
+
+def _unquote(text):
+    return _UNESCAPED.sub(lambda m: _UNESCAPES[m.group()], text[1:-1])
+
+def _string(kind, text):
+    if kind == "bare":
+        return Token(text)
+    token = Token(_unquote(text) if kind == "quoted" else text)
+    if quote(token) != text:
+        token.raw = text
+    return token
+
+def parse(buffer):
+    """Project parsed from bytes, a bytearray or an mmap
+
+    A single pass over the token matches with an explicit stack of open
+    containers; each frame is [items, key, start offset, state].
+    """
+    header = None
+    section = None
+    sections = {}
+    stack = []
+    frame = None
+    last = None  # last string, for the comment that may follow it on its line
+    value = None
+    for match in _TOKEN.finditer(buffer):
+        kind = match.lastgroup
+        if kind == "punct":
+            last = None
+            char = match.group(kind)
+            # Dictionary states: 0 key or "}", 1 "=", 2 value, 3 ";"
+            # Array states: -1 value or ")", -2 "," or ")"
+            state = frame[3] if frame is not None else None
+            if char in b"{(" and (state in (2, -1) or frame is None and value is None):
+                if frame is not None:
+                    stack.append(frame)
+                frame = [[], None, match.start(kind), 0 if char == b"{" else -1]
+            elif char == b"=" and state == 1:
+                frame[3] = 2
+            elif char == b";" and state == 3:
+                frame[3] = 0
+            elif char == b"," and state == -2:
+                frame[3] = -1
+            elif char == b"}" and state == 0 or char == b")" and state in (-1, -2):
+                items, _, start, state = frame
+                inline = buffer.find(b"\n", start, match.start(kind)) == -1
+                if state == 0:
+                    container = (InlineDict if inline else dict)(items)
+                else:
+                    container = (InlineList if inline else list)(items)
+                if stack:
+                    frame = stack.pop()
+                    _add(frame, container)
+                else:
+                    frame = None
+                    value = container
+            else:
+                raise PBXParseError(f"unexpected {char.decode()!r} at byte {match.start(kind)}")
+        elif kind in ("bare", "quoted", "odd"):
+            token = _string(kind, match.group(kind).decode("utf-8"))
+            last = token
+            if frame is None:
+                raise PBXParseError(f"unexpected string at byte {match.start(kind)}")
+            if frame[3] == 0:
+                frame[1] = token
+                frame[3] = 1
+                if section and len(stack) == 1:
+                    # An entry of the objects dictionary inside a section marker
+                    sections[token] = section
+            elif frame[3] in (2, -1):
+                _add(frame, token)
+            else:
+                raise PBXParseError(f"unexpected string at byte {match.start(kind)}")
+        elif kind == "comment":
+            text = match.group(kind)[2:-2].decode("utf-8").strip()
+            if last is not None and buffer.find(b"\n", match.start(), match.start(kind)) == -1:
+                last.comment = text
+            else:
+                marker = _SECTION.match(text)
+                if marker:
+                    section = marker.group(2) if marker.group(1) == "Begin" else None
+            last = None
+        elif kind == "line":
+            if header is None:
+                header = match.group(kind).decode("utf-8")
+        else:
+            raise PBXParseError(f"unexpected character at byte {match.start(kind)}")
+    if frame is not None or value is None:
+        raise PBXParseError("unexpected end of file")
+    return Project(value, sections, header or HEADER)
+
+def _add(frame, value):
+    """Put a finished value into its parent frame"""
+    if frame[3] == 2:
+        frame[0].append((frame[1], value))
+        frame[3] = 3
+    else:
+        frame[0].append(value)
+        frame[3] = -2
+
+def parse_file(path):
+    """Project parsed from a project.pbxproj file through a memory map"""
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise PBXParseError(f"{path} is empty") from None
+        with buffer:
+            return parse(buffer)
+
+def _scalar(value):
+    text = value.raw if isinstance(value, Token) and value.raw else quote(value)
+    comment = getattr(value, "comment", None)
+    return f"{text} /* {comment} */" if comment else text
+
+def _write(value, depth, out):
+    if isinstance(value, str):
+        out.append(_scalar(value))
+    elif isinstance(value, InlineDict):
+        out.append("{")
+        for key, item in value.items():
+            out.append(f"{_scalar(key)} = ")
+            _write(item, depth, out)
+            out.append("; ")
+        out.append("}")
+    elif isinstance(value, InlineList):
+        out.append("(")
+        for item in value:
+            _write(item, depth, out)
+            out.append(", ")
+        out.append(")")
+    elif isinstance(value, dict):
+        indent = "\t" * (depth + 1)
+        out.append("{\n")
+        for key, item in value.items():
+            out.append(f"{indent}{_scalar(key)} = ")
+            _write(item, depth + 1, out)
+            out.append(";\n")
+        out.append("\t" * depth + "}")
+    else:
+        indent = "\t" * (depth + 1)
+        out.append("(\n")
+        for item in value:
+            out.append(indent)
+            _write(item, depth + 1, out)
+            out.append(",\n")
+        out.append("\t" * depth + ")")
+
+class Project:
+    """Object model of a parsed project file
+
+    root is the top-level dictionary and objects its "objects" dictionary
+    (ID -> object). The isa and back-reference indexes are built on first
+    use and dropped by add() and remove(); edits made directly to objects
+    should call invalidate().
+    """
+
+    def __init__(self, root, sections=None, header=HEADER):
+        self.root = root
+        self.sections = sections or {}
+        self.header = header
+        self._by_isa = None
+        self._referrers = None
+
+    @property
+    def objects(self):
+        return self.root["objects"]
+
+    @property
+    def root_object(self):
+        return self.objects[self.root["rootObject"]]
+
+    def __getitem__(self, object_id):
+        return self.objects[object_id]
+
+    def __contains__(self, object_id):
+        return object_id in self.objects
+
+    def invalidate(self):
+        self._by_isa = None
+        self._referrers = None
+
+    def _index(self):
+        objects = self.objects
+        by_isa = {}
+        referrers = {}
+        for object_id, obj in objects.items():
+            by_isa.setdefault(obj.get("isa"), []).append(object_id)
+            for key, value in obj.items():
+                if key == "isa":
+                    continue
+                stack = [value]
+                while stack:
+                    item = stack.pop()
+                    if isinstance(item, str):
+                        if item in objects:
+                            referrers.setdefault(item, []).append((object_id, key))
+                    elif isinstance(item, dict):
+                        stack.extend(item.keys())
+                        stack.extend(item.values())
+                    else:
+                        stack.extend(item)
+        self._by_isa, self._referrers = by_isa, referrers
+
+    def ids(self, isa):
+        """IDs of every object of an isa, in file order"""
+        if self._by_isa is None:
+            self._index()
+        return self._by_isa.get(isa, [])
+
+    def isa(self, isa):
+        """(ID, object) pairs of every object of an isa, in file order"""
+        return [(object_id, self.objects[object_id]) for object_id in self.ids(isa)]
+
+    def referrers(self, object_id, isa=None):
+        """(referrer ID, key) pairs of objects that point at object_id"""
+        if self._referrers is None:
+            self._index()
+        refs = self._referrers.get(object_id, [])
+        if isa:
+            refs = [ref for ref in refs if self.objects[ref[0]].get("isa") == isa]
+        return refs
+
+    def build_files(self, file_ref):
+        """IDs of the PBXBuildFile objects of a file reference"""
+        return [ref for ref, key in self.referrers(file_ref, "PBXBuildFile") if key == "fileRef"]
+
+    def groups(self, object_id):
+        """IDs of the groups listing object_id among their children"""
+        return [ref for ref, key in self.referrers(object_id)
+                if key == "children" and self.objects[ref].get("isa") in ("PBXGroup", "PBXVariantGroup")]
+
+    def add(self, object_id, obj, comment=None, section=None):
+        """Insert an object; it is written at the end of its section"""
+        object_id = Token(object_id)
+        object_id.comment = comment
+        self.objects[object_id] = obj
+        self.sections[object_id] = section or obj["isa"]
+        self.invalidate()
+        return object_id
+
+    def remove(self, object_id):
+        """Delete an object; references to it are left for the caller to drop"""
+        del self.objects[object_id]
+        self.sections.pop(object_id, None)
+        self.invalidate()
+
+    def _sections(self):
+        """{section: [IDs]} in order of first appearance"""
+        sections = {}
+        for object_id, obj in self.objects.items():
+            section = self.sections.get(object_id) or obj.get("isa")
+            sections.setdefault(section, []).append(object_id)
+        return sections
+
+    def serialize(self):
+        """The project file text, in Xcode's layout"""
+        out = [self.header, "\n{\n"]
+        for key, value in self.root.items():
+            out.append(f"\t{_scalar(key)} = ")
+            if key == "objects":
+                out.append("{\n")
+                for section, ids in self._sections().items():
+                    out.append(f"\n/* Begin {section} section */\n")
+                    for object_id in ids:
+                        out.append(f"\t\t{_scalar(object_id)} = ")
+                        _write(self.objects[object_id], 2, out)
+                        out.append(";\n")
+                    out.append(f"/* End {section} section */\n")
+                out.append("\t}")
+            else:
+                _write(value, 1, out)
+            out.append(";\n")
+        out.append("}\n")
+        return "".join(out)
+
+    def write(self, path):
+        """Write serialize() to path"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.serialize())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Swift source dependency scanner: split the app into module targets
+
+Each source is tokenized with one regex pass that skips comments and
+string literals and collects the type names it declares (class, struct,
+enum, protocol, actor, typealias) and the capitalized names it uses. A
+file depends on every other file that declares a name it uses; files are
+grouped into units by top-level directory (Models, Services, Views), the
+unit graph is condensed into strongly connected components and each
+component outside the app's own top-level files becomes a framework
+target, in dependency layers (Models under Services under Views). When a
+few files tie directories into a cycle (say an app-wide state object in
+Models that uses every service), those files stay in the app target;
+directories that use types declared in the app stay there entirely.
+
+Types used across module boundaries have to be declared `public` (and
+the using files need `import <Module>`) before the split builds; the
+report lists how many each module exports.
+"""
+
+import argparse
+import os
+import re
+import time
+from collections import namedtuple
+
+from swift_sources import SourceIndex
+
+_TOKEN = re.compile(rb"""
+    (?P<skip>//[^\n]*|/\*.*?\*/|\"\"\".*?\"\"\"|"(?:[^"\\\n]|\\.)*")
+  | \b(?:class|struct|enum|protocol|actor|typealias)\s+(?P<declared>[A-Za-z_]\w*)
+  | \b(?P<used>[A-Z]\w*)
+""", re.S | re.X)
+
+# Words that can follow a declaration keyword without naming a type
+_NOT_TYPES = {"func", "var", "let", "case", "subscript", "init", "override", "static", "final"}
+
+APP_UNIT = ""
+
+# Settings every generated framework target gets. Static frameworks are
+# linked into the app, so nothing has to be embedded or signed separately.
+FRAMEWORK_SETTINGS = {
+    "DEFINES_MODULE": "YES",
+    "GENERATE_INFOPLIST_FILE": "YES",
+    "MACH_O_TYPE": "staticlib",
+    "PRODUCT_NAME": "$(TARGET_NAME:c99extidentifier)",
+    "SKIP_INSTALL": "YES",
+}
+
+# name: target name; units: top-level directories; dependencies: module
+# names; layer: 0 for modules that depend on nothing; exported: type names
+# other modules use
+Module = namedtuple("Module", "name units dependencies layer exported")
+
+def scan_source(data):
+    """(declared type names, used capitalized names) of one Swift source"""
+    declared, used = set(), set()
+    for match in _TOKEN.finditer(data):
+        kind = match.lastgroup
+        if kind == "declared":
+            name = match.group(kind).decode()
+            if name not in _NOT_TYPES:
+                declared.add(name)
+        elif kind == "used":
+            used.add(match.group(kind).decode())
+    return declared, used - declared
+
+def unit_of(path):
+    """Top-level directory of a relative path; APP_UNIT for root-level files"""
+    head, sep, _ = path.partition("/")
+    return head if sep else APP_UNIT
+
+def scan_tree(base_path, swift_files):
+    """({path: declared}, {path: used}) for every source"""
+    declared, used = {}, {}
+    for path in swift_files:
+        with open(os.path.join(base_path, path), "rb") as f:
+            declared[path], used[path] = scan_source(f.read())
+    return declared, used
+
+def file_graph(declared, used):
+    """{path: {paths it depends on}}
+
+    Names declared in more than one file (nested types such as CodingKeys)
+    cannot be attributed and are ignored.
+    """
+    owners = {}
+    for path, names in declared.items():
+        for name in names:
+            owners.setdefault(name, []).append(path)
+    graph = {}
+    for path, names in used.items():
+        depends = set()
+        for name in names:
+            owner = owners.get(name)
+            if owner and len(owner) == 1 and owner[0] != path:
+                depends.add(owner[0])
+        graph[path] = depends
+    return graph
+
+def unit_graph(files, units):
+    """{unit: {unit: number of its files depending on that unit}}"""
+    graph = {unit: {} for unit in set(units.values())}
+    for path, depends in files.items():
+        unit = units[path]
+        for other in {units[dep] for dep in depends} - {unit}:
+            graph[unit][other] = graph[unit].get(other, 0) + 1
+    return graph
+
+def break_cycles(files, units):
+    """Keep files in the app target until no cycle joins two modules
+
+    For every cycle, the dependency between two of its units carried by the
+    fewest files is dropped by leaving those files in the app (e.g. an
+    app-wide state object kept in Models that uses every service). Updates
+    units in place; returns (final unit graph, moved paths).
+    """
+    moved = []
+    while True:
+        graph = unit_graph(files, units)
+        cycle = next((component for component in strongly_connected(graph)
+                      if len(component) > 1 and APP_UNIT not in component), None)
+        if cycle is None:
+            return graph, moved
+        _, source, target = min((count, unit, other) for unit in cycle
+                                for other, count in graph[unit].items() if other in cycle)
+        for path, depends in files.items():
+            if units[path] == source and any(units[dep] == target for dep in depends):
+                units[path] = APP_UNIT
+                moved.append(path)
+
+def strongly_connected(graph):
+    """Strongly connected components of graph, dependencies before dependents
+
+    Tarjan's algorithm with an explicit stack, so deep graphs do not hit the
+    recursion limit.
+    """
+    index, low, on_stack = {}, {}, set()
+    stack, components = [], []
+    counter = 0
+    for start in sorted(graph):
+        if start in index:
+            continue
+        work = [(start, iter(sorted(graph[start])))]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(graph[child]))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+    return components
+
+def propose_modules(graph, exported):
+    """Modules for every component that does not hold the app's own files
+
+    Components come out of strongly_connected() with dependencies first, so
+    layers are assigned in a single pass. Components that contain the app
+    unit (directly or through a cycle) stay in the app target, and so do
+    components that depend on one: a framework cannot see the app's code.
+    """
+    modules = []
+    component_of = {}
+    for component in strongly_connected(graph):
+        targets = {component_of[dep] for unit in component for dep in graph[unit] if dep not in component}
+        if APP_UNIT in component or None in targets:
+            for unit in component:
+                component_of[unit] = None
+            continue
+        name = "".join(component)
+        dependencies = sorted(targets)
+        layer = 1 + max((module.layer for module in modules if module.name in dependencies), default=-1)
+        modules.append(Module(name, component, dependencies, layer,
+                              sorted(set().union(*(exported.get(unit, ()) for unit in component)))))
+        for unit in component:
+            component_of[unit] = name
+    return modules
+
+def exported_names(declared, files, units):
+    """{unit: type names that files of other units use}"""
+    exported = {}
+    for path, depends in files.items():
+        for dep in depends:
+            if units[dep] != units[path]:
+                exported.setdefault(units[dep], set()).update(declared[dep])
+    return exported
+
+# modules: proposed Modules; moved: paths left in the app to break cycles;
+# graph: unit graph after moving them
+Analysis = namedtuple("Analysis", "modules moved graph")
+
+def analyze(base_path, swift_files):
+    """Analysis of the sources of a tree"""
+    declared, used = scan_tree(base_path, swift_files)
+    files = file_graph(declared, used)
+    units = {path: unit_of(path) for path in swift_files}
+    graph, moved = break_cycles(files, units)
+    modules = propose_modules(graph, exported_names(declared, files, units))
+    return Analysis(modules, moved, graph)
+
+def split_spec(data, analysis, app):
+    """Spec document with a framework target per module, linked into app"""
+    targets = dict(data["targets"])
+    if app not in targets:
+        raise ValueError(f"no target {app!r} in the spec")
+    app_entry = dict(targets.pop(app))
+    bundle_id = app_entry.get("settings", {}).get("base", {}).get("PRODUCT_BUNDLE_IDENTIFIER", app)
+    moved = {}
+    for path in analysis.moved:
+        moved.setdefault(unit_of(path), []).append(path)
+    split = {}
+    exclude = list(app_entry.get("exclude", []))
+    for module in analysis.modules:
+        if module.name in targets:
+            raise ValueError(f"module {module.name!r} clashes with an existing target")
+        kept = [path for unit in module.units for path in moved.get(unit, ())]
+        split[module.name] = {
+            "type": "framework",
+            "sources": [f"{unit}/**/*.swift" for unit in module.units],
+            "exclude": kept,
+            "include": app_entry.get("include", []),
+            "settings": {"base": {**FRAMEWORK_SETTINGS, "PRODUCT_BUNDLE_IDENTIFIER": f"{bundle_id}.{module.name}"}},
+            "dependencies": module.dependencies,
+        }
+        exclude += [f"{unit}/**" for unit in module.units] + [f"!{path}" for path in kept]
+    app_entry["exclude"] = exclude
+    app_entry["dependencies"] = app_entry.get("dependencies", []) + [module.name for module in analysis.modules]
+    split[app] = app_entry
+    split.update(targets)
+    return {**data, "targets": split}
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose module targets from Swift source dependencies")
+    parser.add_argument("root", nargs="?", default=".", help="project source directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    swift_files = SourceIndex(args.root).scan()
+    analysis = analyze(args.root, swift_files)
+    elapsed = time.perf_counter() - start
+
+    for unit in sorted(analysis.graph):
+        depends = ", ".join(f"{dep or '(app)'} x{count}" for dep, count in sorted(analysis.graph[unit].items()))
+        print(f"{unit or '(app)':>12} -> {depends or '-'}")
+    for path in analysis.moved:
+        print(f"↩️  {path} stays in the app target to break a dependency cycle")
+    print()
+    for module in sorted(analysis.modules, key=lambda module: (module.layer, module.name)):
+        depends = f" depends on {', '.join(module.dependencies)}" if module.dependencies else ""
+        print(f"📦 layer {module.layer}: {module.name} ({', '.join(module.units)}){depends}; "
+              f"{len(module.exported)} types need to be public")
+    print(f"\n✅ Scanned {len(swift_files)} files in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Swift source discovery with a persisted directory index
+
+A directory's mtime changes whenever an entry is added to, removed from or
+renamed inside it, so a directory whose mtime matches the index does not
+need to be listed again: its Swift files and subdirectories are taken from
+the index and only its subdirectories are stat()ed. A rescan after a small
+change lists just the directories that changed.
+"""
+
+import json
+import os
+import time
+
+INDEX_VERSION = 1
+SKIP_DIRS = {"build", "DerivedData"}
+# Directories modified this recently are listed again on the next scan, in
+# case a second change lands within the filesystem's mtime granularity
+RACY_NS = 2 * 10**9
+
+def skip_dir(name):
+    """Hidden, build output and Xcode bundle directories are never scanned"""
+    return name.startswith(".") or name in SKIP_DIRS or name.endswith((".xcodeproj", ".xcassets"))
+
+class SourceIndex:
+    """Swift files under root, rescanned through a directory mtime index
+
+    index_path is where the index is persisted between runs (None keeps it
+    in memory only). scan() returns the sorted relative paths.
+    """
+
+    def __init__(self, root, index_path=None, extension=".swift"):
+        self.root = root
+        self.index_path = index_path
+        self.extension = extension
+        # relative directory -> [mtime_ns, [file names], [subdirectory names]]
+        self.dirs = {}
+        self.listed = 0
+        if index_path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("extension") == self.extension:
+            self.dirs = data["dirs"]
+
+    def save(self):
+        """Persist the index (atomically) when an index path was given"""
+        if not self.index_path:
+            return
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "extension": self.extension, "dirs": self.dirs}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _list(self, path):
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not skip_dir(entry.name):
+                        subdirs.append(entry.name)
+                elif entry.name.endswith(self.extension):
+                    files.append(entry.name)
+        self.listed += 1
+        return sorted(files), sorted(subdirs)
+
+    def scan(self):
+        """Sorted relative paths of every source file, updating the index"""
+        found = []
+        seen = {}
+        self.listed = 0
+        racy = time.time_ns() - RACY_NS
+        stack = [("", os.stat(self.root).st_mtime_ns)]
+        while stack:
+            rel, mtime = stack.pop()
+            cached = self.dirs.get(rel)
+            if cached and cached[0] == mtime:
+                files, subdirs = cached[1], cached[2]
+            else:
+                files, subdirs = self._list(os.path.join(self.root, rel))
+            seen[rel] = [mtime if mtime < racy else -1, files, subdirs]
+            prefix = f"{rel}/" if rel else ""
+            found.extend(prefix + name for name in files)
+            for name in subdirs:
+                try:
+                    sub_mtime = os.stat(os.path.join(self.root, prefix + name)).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                stack.append((prefix + name, sub_mtime))
+        self.dirs = seen
+        found.sort()
+        return found
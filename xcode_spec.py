@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Project spec for the Xcode generator: targets, configurations and settings
+
+A spec is a JSON or TOML file (see project_spec.json):
+
+    name                   project name (TenX -> TenX.xcodeproj)
+    configurations         configuration names, e.g. ["Debug", "Release"]
+    default_configuration  defaults to the last configuration
+    settings               project-level {"base": {...}, "<configuration>": {...}}
+    shared                 named settings sets that targets can include
+    targets                {name: target}, in the order they are written
+
+and each target:
+
+    type          application, framework, app-extension or unit-test
+    sources       globs of source paths relative to the root ("**/*.swift")
+    exclude       globs of source paths to leave out; a glob starting with
+                  "!" keeps the paths it matches after all
+    resources     resource paths, copied by the Resources phase
+    info_plist    Info.plist path, listed with the resources
+    include       names from shared, merged before the target's own settings
+    settings      {"base": {...}, "<configuration>": {...}}
+    dependencies  names of targets to build (and, for frameworks, link) first
+
+Settings merge base then configuration, shared sets before the target's
+own; the resolved dictionaries are compared so identical ones are
+rendered only once.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+# type -> (productType, explicitFileType, product extension)
+TARGET_TYPES = {
+    "application": ("com.apple.product-type.application", "wrapper.application", "app"),
+    "framework": ("com.apple.product-type.framework", "wrapper.framework", "framework"),
+    "app-extension": ("com.apple.product-type.app-extension", "wrapper.app-extension", "appex"),
+    "unit-test": ("com.apple.product-type.bundle.unit-test", "wrapper.cfbundle", "xctest"),
+}
+
+# data is the document the spec was built from
+Spec = namedtuple("Spec", "name configurations default_configuration settings targets data")
+Target = namedtuple("Target", "name type product sources resources info_plist settings dependencies")
+
+class SpecError(ValueError):
+    """Invalid project spec; the message names the offending entry"""
+
+def glob_regex(patterns):
+    """One compiled regex matching relative paths against any of the globs
+
+    "**/" matches any number of directories (including none), "*" and "?"
+    stay within one path component.
+    """
+    parts = []
+    for pattern in patterns:
+        regex = ""
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex += "(?:[^/]+/)*"
+                i += 3
+            elif pattern.startswith("**", i):
+                regex += ".*"
+                i += 2
+            elif pattern[i] == "*":
+                regex += "[^/]*"
+                i += 1
+            elif pattern[i] == "?":
+                regex += "[^/]"
+                i += 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+        parts.append(regex)
+    return re.compile(f"(?:{'|'.join(parts)})\\Z" if parts else "(?!)")
+
+def _settings(entry, configurations, where):
+    settings = entry.get("settings", {})
+    unknown = set(settings) - {"base", *configurations}
+    if unknown:
+        raise SpecError(f"{where}: settings for unknown configuration {sorted(unknown)[0]!r}")
+    return {name: {**settings.get("base", {}), **settings.get(name, {})} for name in configurations}
+
+def _source_matchers(entry):
+    """(include, exclude, keep) regexes of a target's source globs"""
+    exclude = entry.get("exclude", [])
+    return (glob_regex(entry.get("sources", ["**/*.swift"])),
+            glob_regex([pattern for pattern in exclude if not pattern.startswith("!")]),
+            glob_regex([pattern[1:] for pattern in exclude if pattern.startswith("!")]))
+
+def _target(name, entry, spec):
+    where = f"target {name!r}"
+    kind = entry.get("type", "application")
+    if kind not in TARGET_TYPES:
+        raise SpecError(f"{where}: unknown type {kind!r}")
+    settings = {configuration: {} for configuration in spec["configurations"]}
+    for shared in entry.get("include", ()):
+        if shared not in spec.get("shared", {}):
+            raise SpecError(f"{where}: unknown shared settings {shared!r}")
+        for configuration in settings:
+            settings[configuration].update(spec["shared"][shared])
+    for configuration, values in _settings(entry, spec["configurations"], where).items():
+        settings[configuration].update(values)
+    for dependency in entry.get("dependencies", ()):
+        if dependency not in spec["targets"] or dependency == name:
+            raise SpecError(f"{where}: unknown dependency {dependency!r}")
+    return Target(
+        name=name,
+        type=kind,
+        product=f"{name}.{TARGET_TYPES[kind][2]}",
+        sources=_source_matchers(entry),
+        resources=list(entry.get("resources", ())),
+        info_plist=entry.get("info_plist"),
+        settings=settings,
+        dependencies=list(entry.get("dependencies", ())),
+    )
+
+def build_spec(data):
+    """Spec from the parsed JSON/TOML document"""
+    for key in ("name", "configurations", "targets"):
+        if not data.get(key):
+            raise SpecError(f"spec needs {key!r}")
+    configurations = list(data["configurations"])
+    default = data.get("default_configuration", configurations[-1])
+    if default not in configurations:
+        raise SpecError(f"default_configuration {default!r} is not a configuration")
+    return Spec(
+        name=data["name"],
+        configurations=configurations,
+        default_configuration=default,
+        settings=_settings(data, configurations, "project"),
+        targets=[_target(name, entry, data) for name, entry in data["targets"].items()],
+        data=data,
+    )
+
+def load_spec(path):
+    """Spec from a .json or .toml file"""
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise SpecError("TOML specs need Python 3.11 or later (tomllib)") from None
+        with open(path, "rb") as f:
+            return build_spec(tomllib.load(f))
+    with open(path) as f:
+        return build_spec(json.load(f))
+
+def target_sources(spec, swift_files):
+    """{target name: [paths]} from one pass over the discovered sources"""
+    matchers = [(target.name, *target.sources) for target in spec.targets]
+    members = {target.name: [] for target in spec.targets}
+    for path in swift_files:
+        for name, include, exclude, keep in matchers:
+            if include.match(path) and (not exclude.match(path) or keep.match(path)):
+                members[name].append(path)
+    return members
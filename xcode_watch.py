@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Watch a source tree and regenerate the Xcode project when Swift files change
+
+On Linux the watcher uses inotify through ctypes: every directory gets a
+watch for entries being created, deleted or moved, and only events for
+.swift files or directories count as changes. Elsewhere (or when inotify
+is unavailable) it falls back to polling the directory mtime index. Bursts
+of events, such as a git checkout, are debounced into one regeneration.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from swift_sources import SourceIndex, skip_dir
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """Recursive inotify watch of the directories under root"""
+
+    def __init__(self, root, extension=".swift"):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.extension = extension
+        self.watches = {}
+        self._watch_tree(root)
+
+    def _watch_tree(self, top):
+        for directory, subdirs, _ in os.walk(top):
+            subdirs[:] = [name for name in subdirs if not skip_dir(name)]
+            wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = directory
+
+    def _relevant(self, mask, name):
+        return bool(mask & (IN_ISDIR | IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF)) \
+            or name.endswith(self.extension)
+
+    def wait(self, timeout=None):
+        """Block until relevant events arrive (or timeout); True if any did"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        changed = False
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0"))
+            offset += _EVENT.size + length
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if not self._relevant(mask, name):
+                continue
+            changed = True
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not skip_dir(name):
+                self._watch_tree(os.path.join(self.watches.get(wd, self.root), name))
+            elif mask & IN_Q_OVERFLOW:
+                self._watch_tree(self.root)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback watcher: rescan the source index every interval seconds"""
+
+    def __init__(self, root, interval=1.0, extension=".swift"):
+        self.index = SourceIndex(root, extension=extension)
+        self.files = self.index.scan()
+        self.interval = interval
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            files = self.index.scan()
+            if files != self.files:
+                self.files = files
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.interval if deadline is None
+                       else max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+def make_watcher(root, poll=False):
+    """InotifyWatcher where available, otherwise a PollingWatcher"""
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+def watch(root, regenerate, debounce=0.2, poll=False):
+    """Call regenerate() after every debounced burst of Swift file changes
+
+    Runs until interrupted. A burst ends once no relevant event has arrived
+    for debounce seconds.
+    """
+    watcher = make_watcher(root, poll)
+    print(f"👀 Watching {root} ({type(watcher).__name__}), Ctrl-C to stop")
+    try:
+        while True:
+            if not watcher.wait():
+                continue
+            while watcher.wait(debounce):
+                pass
+            regenerate()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()